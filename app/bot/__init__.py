@@ -2,5 +2,7 @@
 Bot Module — Telegram интерфейс
 """
 from app.bot.keyboards import get_main_keyboard
+from app.bot.middlewares import AdminOnlyMiddleware
+from app.bot.session import KeepAliveSession
 
-__all__ = ['get_main_keyboard']
+__all__ = ['get_main_keyboard', 'AdminOnlyMiddleware', 'KeepAliveSession']
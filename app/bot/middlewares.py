@@ -0,0 +1,64 @@
+"""
+Middlewares — Фильтрация апдейтов до хэндлеров
+Бот личный: всё, что пришло не от админа, отбрасывается сразу
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+
+
+# Команды, на которые чужим отвечаем отказом (остальное молча игнорируем)
+DENIED_REPLY_COMMANDS = {"/start", "/restart"}
+
+# Отказ одному пользователю — не чаще раза в минуту (флуд не превращается в исходящий флуд)
+DENIED_REPLY_INTERVAL = 60
+DENIED_CACHE_SIZE = 256
+
+
+class AdminOnlyMiddleware(BaseMiddleware):
+    """
+    Outer middleware для dp.message
+
+    Срабатывает до проверки фильтров — чужие сообщения
+    не проходят цепочку хэндлеров вообще.
+    """
+
+    def __init__(self, *admin_ids: int):
+        # frozenset: проверка одна и та же для одного и нескольких админов
+        self.admin_ids = frozenset(admin_ids)
+        # user_id -> время последнего отказа (LRU, ограничен DENIED_CACHE_SIZE)
+        self._denied_at: OrderedDict = OrderedDict()
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = event.from_user
+        if user and user.id in self.admin_ids:
+            return await handler(event, data)
+
+        words = (event.text or "").split(maxsplit=1)
+        if words and words[0].split("@")[0] in DENIED_REPLY_COMMANDS and self._should_deny_reply(user):
+            await event.answer("⛔ Доступ запрещён")
+        return None
+    
+    def _should_deny_reply(self, user) -> bool:
+        """Можно ли ответить отказом (не чаще DENIED_REPLY_INTERVAL на пользователя)"""
+        if user is None:
+            return False
+        
+        now = time.monotonic()
+        last = self._denied_at.get(user.id)
+        if last is not None and now - last < DENIED_REPLY_INTERVAL:
+            return False
+        
+        self._denied_at[user.id] = now
+        self._denied_at.move_to_end(user.id)
+        if len(self._denied_at) > DENIED_CACHE_SIZE:
+            self._denied_at.popitem(last=False)
+        return True
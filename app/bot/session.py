@@ -0,0 +1,55 @@
+"""
+Session — HTTP сессия бота с настроенным пулом соединений
+aiogram 3.4 не принимает connector снаружи, поэтому ClientSession собираем сами
+"""
+import asyncio
+import ssl
+from typing import Any, Optional
+
+import certifi
+from aiohttp import ClientSession, TCPConnector
+from aiohttp.hdrs import USER_AGENT
+from aiohttp.http import SERVER_SOFTWARE
+from aiogram import __version__ as aiogram_version
+from aiogram.client.session.aiohttp import AiohttpSession
+
+
+class KeepAliveSession(AiohttpSession):
+    """
+    AiohttpSession с keep-alive пулом к api.telegram.org
+
+    Соединения живут между уведомлениями — без TLS handshake на каждое сообщение.
+    Прокси не поддерживается (боту он не нужен).
+    """
+
+    def __init__(self, limit: int, keepalive_timeout: float, ttl_dns_cache: int, **kwargs: Any):
+        if kwargs.get('proxy') is not None:
+            raise ValueError("KeepAliveSession не поддерживает прокси")
+        super().__init__(**kwargs)
+
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self._client: Optional[ClientSession] = None
+
+    def _build_connector(self) -> TCPConnector:
+        return TCPConnector(
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+            limit=self.limit,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+    async def create_session(self) -> ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = ClientSession(
+                connector=self._build_connector(),
+                headers={USER_AGENT: f"{SERVER_SOFTWARE} aiogram/{aiogram_version}"},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+            # Даём SSL соединениям закрыться (как в AiohttpSession.close)
+            await asyncio.sleep(0.25)
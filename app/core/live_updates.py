@@ -3,6 +3,7 @@ Live Updates — Живые обновления в чат
 Бот постоянно рассказывает что делает
 """
 import asyncio
+import heapq
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from dataclasses import dataclass, field
@@ -219,7 +220,7 @@ class LiveUpdatesManager:
         lines = []
         alert_coin = None
         
-        for symbol, rate in sorted(rates.items(), key=lambda x: abs(x[1]), reverse=True)[:5]:
+        for symbol, rate in heapq.nlargest(5, rates.items(), key=lambda x: abs(x[1])):
             rate_pct = rate * 100
             
             if abs(rate_pct) >= 0.05:
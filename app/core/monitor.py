@@ -9,6 +9,7 @@ Market Monitor — Главный цикл с AI
 import asyncio
 import json
 import os
+import tempfile
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 
@@ -55,6 +56,7 @@ class MarketMonitor:
     
     def __init__(self):
         self.running: bool = False
+        self.started_event: asyncio.Event = asyncio.Event()  # Символы и баланс готовы
         self.check_interval: int = 60  # секунд
         self.news_interval: int = 300  # 5 минут
         self.position_check_interval: int = 30  # 30 сек для активных позиций
@@ -230,8 +232,17 @@ class MarketMonitor:
                 "last_update": datetime.utcnow().isoformat()
             }
             
-            with open(BOT_STATUS_FILE, 'w') as f:
-                json.dump(status, f, indent=2)
+            # Атомарно: WebApp читает файл параллельно, бот пишет его же из потока —
+            # у каждой записи свой tmp
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(BOT_STATUS_FILE), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    os.fchmod(f.fileno(), 0o644)
+                    json.dump(status, f, indent=2)
+                os.replace(tmp_file, BOT_STATUS_FILE)
+            except Exception:
+                os.unlink(tmp_file)
+                raise
                 
         except Exception as e:
             logger.error(f"Status file update error: {e}")
@@ -306,6 +317,9 @@ class MarketMonitor:
         if not self.paper_trading:
             await self.sync_balance_from_exchange()
         
+        # Статус можно показывать — символы и баланс готовы
+        self.started_event.set()
+        
         # Первоначальная загрузка новостей
         await self._update_news_context()
         
@@ -335,6 +349,7 @@ class MarketMonitor:
     async def stop(self):
         """Остановить"""
         self.running = False
+        self.started_event.clear()
         self._update_status_file()
         
         # Завершаем текущий сеанс
@@ -1350,8 +1365,8 @@ class MarketMonitor:
                 ""
             ]
             
-            total_pnl = 0.0
-            total_pnl_usd = 0.0
+            total_pnl = sum(t.pnl_percent for t in active_trades)
+            total_pnl_usd = sum(t.pnl_usd for t in active_trades)
             
             for trade in active_trades:
                 dir_emoji = "🟢" if trade.direction == "LONG" else "🔴"
@@ -1367,9 +1382,6 @@ class MarketMonitor:
                     f"   {pnl_emoji} PnL: *{trade.pnl_percent:+.2f}%* (${trade.pnl_usd:+.2f})\n"
                     f"   🕐 {hours_in_trade:.1f}h | SL двигали: {trade.sl_moves}x"
                 )
-                
-                total_pnl += trade.pnl_percent
-                total_pnl_usd += trade.pnl_usd
             
             # Итого
             total_emoji = "✅" if total_pnl >= 0 else "⚠️"
@@ -9,6 +9,11 @@ CryptoDen — Точка входа
 import asyncio
 import signal as sig
 
+try:
+    import uvloop  # libuv event loop — быстрее для сотен мелких HTTP запросов
+except ImportError:  # Windows / не установлен — обычный asyncio
+    uvloop = None
+
 from app.core.logger import logger
 from app.notifications import telegram_bot
 
@@ -68,6 +73,11 @@ async def run_flask_server():
 async def main():
     """Главная функция — Telegram + Flask WebApp"""
     
+    # Python 3.12+: create_task выполняет корутину сразу до первого реального ожидания
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+    
     logger.info("=" * 60)
     logger.info("🤖 CRYPTODEN BOT v3.0 READY")
     logger.info("=" * 60)
@@ -109,6 +119,9 @@ async def shutdown():
 
 
 if __name__ == "__main__":
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -13,6 +13,7 @@ Timing:
 - Выходим после начисления или по TP/SL
 """
 import asyncio
+import heapq
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -463,6 +464,14 @@ class FundingScalper(BaseModule):
         
         return signals
     
+    def _top_funding_rates(self, limit: int) -> List[FundingData]:
+        """Самые аномальные rates по модулю (без полной сортировки кэша)"""
+        return heapq.nlargest(
+            limit,
+            self.funding_cache.values(),
+            key=lambda x: abs(x.funding_rate_percent)
+        )
+    
     async def get_status(self) -> Dict:
         """Статус Funding Scalper"""
         
@@ -470,11 +479,7 @@ class FundingScalper(BaseModule):
         next_funding = self._get_next_funding_time()
         
         # Топ funding rates
-        top_rates = sorted(
-            self.funding_cache.values(),
-            key=lambda x: abs(x.funding_rate_percent),
-            reverse=True
-        )[:5]
+        top_rates = self._top_funding_rates(5)
         
         win_rate = 0
         if self.stats["total_trades"] > 0:
@@ -520,11 +525,7 @@ class FundingScalper(BaseModule):
             win_rate = self.stats["winning_trades"] / self.stats["total_trades"] * 100
         
         # Топ rates
-        top_rates = sorted(
-            self.funding_cache.values(),
-            key=lambda x: abs(x.funding_rate_percent),
-            reverse=True
-        )[:5]
+        top_rates = self._top_funding_rates(5)
         
         rates_text = ""
         for f in top_rates:
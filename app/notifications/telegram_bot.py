@@ -3,19 +3,40 @@ Telegram Bot — Чистый интерфейс
 Управление ТОЛЬКО через WebApp
 """
 import asyncio
-import json
+import html
 import os
-from typing import Optional, Dict
-
+import re
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, List
+
+import orjson
 from aiogram import Bot, Dispatcher, types, F
 from aiogram.filters import Command
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.types import BotCommand
 
 from app.core.config import settings
 from app.core.logger import logger
 from app.bot.keyboards import get_main_keyboard
+from app.bot.middlewares import AdminOnlyMiddleware
+from app.bot.session import KeepAliveSession
 from app.core.smart_notifications import smart_notifications
+from app.ai.whale_ai import whale_ai, check_whale_activity
+from app.backtesting.data_loader import BybitDataLoader
+from app.intelligence.news_parser import news_parser
+from app.strategies import get_enabled_strategies, strategy_checker
+from app.strategies.indicators import TechnicalIndicators
+from app.trading.bybit.client import BybitClient
+
+try:
+    from watchfiles import Change, awatch  # inotify вместо опроса файлов
+except ImportError:  # не установлен — опрашиваем по таймеру
+    Change = awatch = None
 
 # Файлы данных
 SETTINGS_FILE = "/root/crypto-bot/data/webapp_settings.json"
@@ -23,25 +44,432 @@ START_REQUESTED_FILE = "/root/crypto-bot/data/start_requested.json"
 STOP_REQUESTED_FILE = "/root/crypto-bot/data/stop_requested.json"
 BOT_STATUS_FILE = "/root/crypto-bot/data/bot_status.json"
 
+# Папка, куда WebApp кладёт запросы запуска/остановки
+CONTROL_DIR = os.path.dirname(START_REQUESTED_FILE)
+CONTROL_FILES = frozenset({os.path.basename(START_REQUESTED_FILE), os.path.basename(STOP_REQUESTED_FILE)})
+
+# Эмодзи направления и результата сделки
+DIRECTION_EMOJI = {"LONG": "🟢", "SHORT": "🔴"}
+RESULT_EMOJI = {True: "✅", False: "❌"}
+
+# Причина закрытия (CloseReason.value) -> эмодзи
+CLOSE_REASON_EMOJI = {
+    "take_profit": "🎯",
+    "stop_loss": "🛑",
+    "trailing_stop": "📈",
+    "manual": "👤",
+    "expired": "⏰",
+}
+
+# Иконки модулей
+MODULE_ICONS = {
+    'director': '🎩',
+    'grid': '📊',
+    'funding': '💰',
+    'arbitrage': '🔄',
+    'listing': '🆕',
+    'worker': '👷'
+}
+
+# Режим рынка из новостей: (эмодзи, название, описание)
+MARKET_MODE_INFO = {
+    'NORMAL': ('🟢', 'Нормальный', 'Можно торговать'),
+    'NEWS_ALERT': ('🟡', 'Осторожность', 'Важные новости'),
+    'WAIT_EVENT': ('🔴', 'Ожидание', 'Важное событие скоро')
+}
+
+# Шапка экрана новостей — режимов три, собираем заранее
+NEWS_HEADER_TEMPLATE = """📰 <b>Новости крипторынка</b>
+
+{0} <b>Режим: {1}</b>
+<i>{2}</i>
+
+"""
+NEWS_HEADERS = {mode: NEWS_HEADER_TEMPLATE.format(*info) for mode, info in MARKET_MODE_INFO.items()}
+NEWS_HEADER_UNKNOWN = NEWS_HEADER_TEMPLATE.format('⚪', 'Неизвестно', '')
+NEWS_TITLE_MAX = 55
+
+# Торговый bias от Whale AI
+BIAS_EMOJI = {"BULLISH": "🟢", "BEARISH": "🔴", "NEUTRAL": "⚪"}
+
+# Шаблон экрана статуса (подставляется через format_map)
+STATUS_TEMPLATE = """{status}
+
+🧠 AI: {ai}  •  🔐 API: {api_status}
+
+💰 *Баланс:* ${balance:,.2f}
+💵 *Сделка:* ${trade_size:,.2f} ({percent}%)
+📊 *Позиции:* {active}/{max_trades}
+
+📈 *Сегодня:* ${today_pnl:+,.2f}
+💎 *Всего:* ${total_pnl:+,.2f}
+🎯 *Win Rate:* {win_rate:.1f}%
+
+*Модули:* {modules}
+
+🚀 CryptoDen — управление ботом"""
+
+# Шаблон личного кабинета (format_map)
+CABINET_TEMPLATE = """👤 *КАБИНЕТ*
+
+💎 *Подписка:* Premium
+📅 *Активна до:* ∞
+
+━━━━━━━━━━━━━━━
+
+💰 *Баланс:* ${balance:,.2f}
+
+{pnl_emoji} *Общий P&L:* ${total_pnl:+,.2f}
+{today_emoji} *Сегодня:* ${today_pnl:+,.2f}
+
+📊 *Статистика:*
+• Всего сделок: {total}
+• Выигрышных: {wins}
+• Win Rate: {win_rate:.1f}%
+
+📈 *Лучшая сделка:* ${best:+.2f}
+📉 *Худшая сделка:* ${worst:+.2f}
+
+━━━━━━━━━━━━━━━
+
+🤖 *Бот:* {bot}
+🧠 *AI:* {ai}
+📝 *Режим:* {mode}"""
+
+# Шаблоны торговых уведомлений (HTML, подставляются через format_map)
+SIGNAL_TEMPLATE = """{emoji} <b>СИГНАЛ: {symbol}</b>
+
+{direction} • {strategy}
+WR: {win_rate:.1f}%
+
+Entry: ${entry:,.4f}"""
+
+TRADE_OPENED_TEMPLATE = """✅ <b>ОТКРЫТА: {symbol}</b>
+
+{emoji} {direction} • ${value:,.2f}
+🎯 Entry: ${entry:,.4f}"""
+
+TRADE_CLOSED_TEMPLATE = """{emoji} <b>ЗАКРЫТА: {symbol}</b>
+
+P&amp;L: <b>{pnl_percent:+.2f}%</b> (${pnl:+.2f})
+Причина: {reason_emoji} {reason}"""
+
+AI_DECISION_TEMPLATE = """🧠 <b>AI: {action}</b>
+
+Confidence: {confidence}%
+{reason}"""
+
+
+# Меню команд бота (ставится один раз при старте polling)
+BOT_COMMANDS = [
+    BotCommand(command="start", description="🏠 Главное меню"),
+    BotCommand(command="restart", description="🔄 Перезапуск бота")
+]
+
+# Аргумент /analyze: тикер монеты (латиница/цифры), всё прочее — подсказка
+ANALYZE_ARG_RE = re.compile(r"^/\S+\s+([A-Za-z0-9]{2,15})\s*$")
+
+# Теги HTML-разметки — убираются при отправке без форматирования
+HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+
+# Статичные экраны (без подстановок, HTML — "_" в командах не экранируем)
+WELCOME_TEXT = """🦊 <b>CryptoDen v3.0</b>
+
+Добро пожаловать в умного крипто-бота!
+
+🧠 <b>Adaptive Brain</b> — анализирует рынок
+⚡ <b>Momentum</b> — ловит резкие движения
+🆕 <b>Listing Hunter</b> — новые монеты
+
+Используй кнопки ниже 👇"""
+
+HELP_TEXT = """❓ <b>Помощь CryptoDen Bot</b>
+
+<b>🚀 CryptoDen</b> — открывает настройки:
+• Запустить / Остановить бота
+• API ключи Bybit
+• Выбор монет
+• Настройки рисков
+• AI параметры
+• Режимы модулей (Signal/Auto)
+
+<b>Кнопки навигации:</b>
+📊 Статус — текущее состояние бота
+🐋 Рынок — Fear &amp; Greed, Funding, OI
+📰 Новости — рыночный контекст
+👤 Кабинет — статистика и P&amp;L
+
+<b>Команды модулей:</b>
+/grid — 📊 Grid Bot статус
+/funding — 💰 Funding Scalper
+/arb — 🔄 Arbitrage Scanner
+/listing — 🆕 Listing Hunter
+/listing_mode — сменить режим (signal/auto)
+
+<b>AI команды:</b>
+/ai — 🧠 Статус AI системы
+/director — 🎩 Решения Директора
+/director_trades — сделки Директора
+/whale — 🐋 Детальный анализ китов
+/market — 📊 Полная картина рынка
+
+<b>Сервис:</b>
+/debug — 🔍 Диагностика"""
+
+BUTTONS_HELP_TEXT = """❓ <b>ПОМОЩЬ — CryptoDen v3.0</b>
+
+━━━━━━━━━━━━━━━━━━
+
+📱 <b>КНОПКИ:</b>
+
+🦊 <b>CryptoDen</b> — панель управления
+• Включить/выключить бота
+• Настроить модули
+• API ключи и риски
+
+📊 <b>Статистика</b> — результаты торговли
+• Win Rate по дням/неделям
+• P&amp;L по источникам сигналов
+• История сделок
+
+🐋 <b>Рынок</b> — whale метрики
+• Fear &amp; Greed Index
+• Long/Short Ratio
+• Funding Rate
+
+📰 <b>Новости</b> — крипто новости
+• Sentiment анализ
+• Важные события
+
+🔍 <b>Анализ</b> — анализ монеты
+• Выбери монету
+• Получи рекомендацию AI
+
+━━━━━━━━━━━━━━━━━━
+
+⚙️ <b>КОМАНДЫ:</b>
+/start — главное меню
+/restart — перезапуск бота
+
+━━━━━━━━━━━━━━━━━━
+
+🧠 <b>МОДУЛИ:</b>
+• Brain — умный анализ рынка
+• Momentum — резкие движения
+• Listing — новые монеты"""
+
+# Подвал /debug
+DEBUG_FOOTER = "\n💡 _Если RSI > 30 — сигналов не будет_\n_Это нормально! Бот ждёт подходящий момент._"
+
+# Подсказки на русском к английским заголовкам новостей
+NEWS_HINTS = {
+    'fed': '🏦 ФРС', 'rate': 'ставка', 'rates': 'ставки',
+    'fomc': 'заседание ФРС', 'powell': 'Пауэлл', 'inflation': 'инфляция',
+    'sec': '⚖️ SEC', 'etf': 'ETF', 'approve': 'одобрение',
+    'reject': 'отклонение', 'delay': 'отсрочка', 'regulation': 'регулирование',
+    'bitcoin': '₿ BTC', 'btc': '₿ BTC', 'halving': 'халвинг',
+    'whale': '🐋 кит', 'whales': '🐋 киты',
+    'ethereum': 'Ξ ETH', 'eth': 'Ξ ETH',
+    'rally': '📈 рост', 'crash': '📉 обвал', 'pump': '🚀 рост',
+    'dump': '💥 падение', 'bullish': '🐂 бычий', 'bearish': '🐻 медвежий',
+    'all-time high': '🏆 ATH', 'ath': '🏆 ATH',
+    'blackrock': '🏢 BlackRock', 'grayscale': '🏢 Grayscale',
+    'binance': 'Binance', 'coinbase': 'Coinbase',
+    'hack': '🔓 взлом', 'exploit': '🔓 эксплойт',
+    'lawsuit': '⚖️ иск', 'ban': '🚫 запрет',
+    'trump': '🇺🇸 Трамп', 'china': '🇨🇳 Китай',
+}
+
+
+@lru_cache(maxsize=256)
+def _news_hint(title: str) -> Optional[str]:
+    """Подсказка к заголовку (новости из кэша — одни и те же заголовки на каждое нажатие)"""
+    title_lower = title.lower()
+    hints = dict.fromkeys(rus for eng, rus in NEWS_HINTS.items() if eng in title_lower)
+    return ' • '.join(islice(hints, 3)) or None
+
+
+# (важность, знак sentiment) -> эмодзи новости; LOW и неизвестное — ⚪
+NEWS_IMPACT_EMOJI = {
+    ('HIGH', -1): '🔴', ('HIGH', 0): '🟡', ('HIGH', 1): '🟢',
+    ('MEDIUM', -1): '🟠', ('MEDIUM', 0): '⚪', ('MEDIUM', 1): '🟢',
+}
+
+
+def _news_impact_emoji(sentiment: float, importance: str) -> str:
+    return NEWS_IMPACT_EMOJI.get((importance, (sentiment > 0) - (sentiment < 0)), '⚪')
+
+
+def _news_impact_text(sentiment: float) -> str:
+    if sentiment > 0.3:
+        return '💹 Позитивно'
+    elif sentiment < -0.3:
+        return '📉 Негативно'
+    return '➖ Нейтрально'
+
+
+# fmt -> (секунда, строка): strftime пересчитывается не чаще раза в секунду
+_CLOCK_CACHE: Dict[str, tuple] = {}
+
+
+def _clock(fmt: str = '%H:%M:%S') -> str:
+    """Текущее локальное время строкой (кэш на текущую секунду)"""
+    sec = int(time.time())
+    cached = _CLOCK_CACHE.get(fmt)
+    if cached and cached[0] == sec:
+        return cached[1]
+    
+    text = datetime.fromtimestamp(sec).strftime(fmt)
+    _CLOCK_CACHE[fmt] = (sec, text)
+    return text
+
+
+def _h(value) -> str:
+    """Экранировать динамический текст для ParseMode.HTML"""
+    return html.escape(str(value), quote=False)
+
+
+def _plain_text(text: str, parse_mode: Optional[str]) -> str:
+    """Текст для повторной отправки без разметки: HTML без тегов и без &amp;-сущностей"""
+    if parse_mode == ParseMode.HTML:
+        return html.unescape(HTML_TAG_RE.sub("", text))
+    return text
+
+
+def _is_parse_error(error: Exception) -> bool:
+    """Telegram не смог разобрать разметку сообщения"""
+    message = str(error).lower()
+    return "parse entities" in message or "can't parse" in message
+
+
+def _is_control_change(change, path: str) -> bool:
+    """Фильтр watchfiles: появление/изменение файлов запросов WebApp"""
+    return change != Change.deleted and os.path.basename(path) in CONTROL_FILES
+
+
+def _read_request_file(path: str) -> Optional[tuple]:
+    """(данные, возраст в сек) файла запроса WebApp или None, если файла нет"""
+    try:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        return data, time.time() - os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+
+def _discard_file(path: str) -> bool:
+    """Удалить файл запроса; True — если он был"""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _orjson_dumps(obj) -> str:
+    """orjson для запросов aiogram (сессия ожидает str, а не bytes)"""
+    return orjson.dumps(obj).decode()
+
+
+# (payload, (st_ino, st_mtime_ns)) последней собственной записи файла статуса
+_last_status_write: Optional[tuple] = None
+
 
 def update_bot_status_file(running: bool, balance: float = 1000, active_trades: int = 0, 
                            paper_trading: bool = True, ai_enabled: bool = True):
-    """Обновить файл статуса для WebApp"""
-    import json
-    os.makedirs(os.path.dirname(BOT_STATUS_FILE), exist_ok=True)
-    with open(BOT_STATUS_FILE, 'w') as f:
-        json.dump({
-            "running": running,
-            "balance": balance,
-            "active_trades": active_trades,
-            "paper_trading": paper_trading,
-            "ai_enabled": ai_enabled
-        }, f)
+    """
+    Обновить файл статуса для WebApp
+    
+    Запись через уникальный tmp + os.replace — WebApp не прочитает полуписаный JSON.
+    Тот же payload не переписывается, если файл с тех пор никто не трогал
+    (монитор пишет в него свой вариант — тогда пишем заново).
+    Из корутин вызывать через asyncio.to_thread.
+    """
+    global _last_status_write
+    payload = orjson.dumps({
+        "running": running,
+        "balance": balance,
+        "active_trades": active_trades,
+        "paper_trading": paper_trading,
+        "ai_enabled": ai_enabled
+    })
+    
+    if _last_status_write and _last_status_write[0] == payload:
+        try:
+            st = os.stat(BOT_STATUS_FILE)
+            # os.replace монитора даёт новый inode даже при совпавшем (грубом) mtime
+            if (st.st_ino, st.st_mtime_ns) == _last_status_write[1]:
+                return
+        except FileNotFoundError:
+            pass
+    
+    status_dir = os.path.dirname(BOT_STATUS_FILE)
+    os.makedirs(status_dir, exist_ok=True)
+    # Уникальный tmp на каждую запись: монитор пишет тот же файл параллельно
+    fd, tmp_file = tempfile.mkstemp(dir=status_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), 0o644)
+            f.write(payload)
+            f.flush()
+            # stat своего дескриптора, а не пути — путь к этому моменту мог заменить монитор
+            st = os.fstat(f.fileno())
+        os.replace(tmp_file, BOT_STATUS_FILE)
+    except Exception:
+        os.unlink(tmp_file)
+        raise
+    _last_status_write = (payload, (st.st_ino, st.st_mtime_ns))
 
 
 class TelegramBot:
     """Telegram бот — текст + Reply Keyboard"""
     
+    # Синглтон с фиксированным набором полей: без __dict__, опечатка = AttributeError
+    __slots__ = (
+        'bot', 'dp', 'admin_id', 'enabled',
+        '_monitor', '_trade_manager',
+        '_outbox', '_sender_task', '_kb_main',
+        '_text_cache', '_last_edit_at', '_last_sent',
+        '_bybit_public', '_btn_routes', '_btn_locks', '_news_context',
+    )
+    
+    # Очередь исходящих уведомлений (лимит Telegram ~30 msg/s)
+    OUTBOX_MAX_SIZE = 1000
+    OUTBOX_BATCH_SIZE = 10
+    OUTBOX_BATCH_WINDOW = 0.2  # сек: ждём соседние уведомления пачки
+    SEND_INTERVAL = 1 / 25
+    MAX_MESSAGE_LENGTH = 4096
+    MESSAGE_SEPARATOR = "\n\n———\n\n"
+    
+    # Пул соединений к api.telegram.org (keep-alive между уведомлениями)
+    CONNECTOR_LIMIT = 20
+    KEEPALIVE_TIMEOUT = 75
+    DNS_CACHE_TTL = 300
+    REQUEST_TIMEOUT = 20  # getUpdates получает + POLLING_TIMEOUT сверху
+    
+    # Запрос запуска из WebApp действителен 60 сек
+    CONTROL_REQUEST_TTL = 60
+    CONTROL_POLL_INTERVAL = 2  # только без watchfiles
+    
+    # Готовые тексты экранов кэшируются (серия нажатий = один расчёт)
+    STATUS_CACHE_TTL = 1.0
+    STATS_CACHE_TTL = 2.0
+    
+    # Telegram пропускает ~1 редактирование сообщения в секунду
+    EDIT_INTERVAL = 1.0
+    
+    # Long polling: сколько секунд Telegram держит getUpdates открытым
+    POLLING_TIMEOUT = 25
+    
+    # Сколько ждать готовности монитора перед ответом о запуске
+    START_WAIT_TIMEOUT = 5.0
+    
+    # Одинаковое уведомление с тем же ключом не повторяем 30 сек
+    DEDUP_TTL = 30.0
+    
+    # Контекст новостей (RSS/календарь/тренды) общий для 📰 и /debug
+    NEWS_CONTEXT_TTL = 30.0
+    
     def __init__(self):
         self.bot: Optional[Bot] = None
         self.dp: Optional[Dispatcher] = None
@@ -51,6 +479,32 @@ class TelegramBot:
         self._monitor = None
         self._trade_manager = None
         
+        # Исходящие уведомления
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=self.OUTBOX_MAX_SIZE)
+        self._sender_task: Optional[asyncio.Task] = None
+        
+        # Клавиатуры не зависят от состояния — строим один раз
+        self._kb_main: Optional[types.ReplyKeyboardMarkup] = None
+        
+        # Кэш текстов экранов: ключ -> (monotonic время, версия, текст)
+        self._text_cache: Dict[str, tuple] = {}
+        
+        # chat_id -> monotonic время последнего edit_text
+        self._last_edit_at: Dict[int, float] = {}
+        
+        # dedup_key -> (monotonic время, hash текста) последней отправки
+        self._last_sent: Dict[str, tuple] = {}
+        
+        # (monotonic время, контекст) последнего news_parser.get_market_context()
+        self._news_context: Optional[tuple] = None
+        
+        # Публичный Bybit клиент (цены) — одна aiohttp сессия на всё время работы
+        self._bybit_public = None
+        
+        # Кнопки Reply Keyboard -> обработчик и его lock (заполняются в _register_handlers)
+        self._btn_routes: Dict[str, object] = {}
+        self._btn_locks: Dict[str, asyncio.Lock] = {}
+        
         self._setup()
     
     def _setup(self):
@@ -60,13 +514,27 @@ class TelegramBot:
             logger.warning("Telegram not configured")
             return
         
-        self.bot = Bot(token=token)
+        self.bot = Bot(token=token, session=self._create_session())
         self.dp = Dispatcher()
+        self.dp.message.outer_middleware(AdminOnlyMiddleware(self.admin_id))
         self.enabled = True
         
+        self._kb_main = get_main_keyboard()
+        
         self._register_handlers()
         logger.info("✅ Telegram bot initialized")
     
+    def _create_session(self) -> KeepAliveSession:
+        """HTTP сессия: постоянные соединения (без TLS handshake на каждое сообщение) + orjson"""
+        return KeepAliveSession(
+            limit=self.CONNECTOR_LIMIT,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=self.DNS_CACHE_TTL,
+            timeout=self.REQUEST_TIMEOUT,
+            json_loads=orjson.loads,
+            json_dumps=_orjson_dumps
+        )
+    
     @property
     def monitor(self):
         if self._monitor is None:
@@ -81,83 +549,93 @@ class TelegramBot:
             self._trade_manager = trade_manager
         return self._trade_manager
     
-    def _is_admin(self, user_id: int) -> bool:
-        return user_id == self.admin_id
+    async def _get_bybit_public(self):
+        """Долгоживущий BybitClient для публичных данных (без TLS handshake на каждый запрос)"""
+        if self._bybit_public is None:
+            client = BybitClient(testnet=False)
+            await client.__aenter__()
+            self._bybit_public = client
+        return self._bybit_public
+    
+    async def _get_market_context(self) -> dict:
+        """Контекст новостей из кэша NEWS_CONTEXT_TTL, иначе свежий запрос"""
+        cached = self._news_context
+        if cached and time.monotonic() - cached[0] < self.NEWS_CONTEXT_TTL:
+            return cached[1]
+        
+        context = await news_parser.get_market_context()
+        self._news_context = (time.monotonic(), context)
+        return context
     
     async def _set_commands(self):
         """Установить команды бота v3.0 — только 2 команды"""
-        commands = [
-            BotCommand(command="start", description="🏠 Главное меню"),
-            BotCommand(command="restart", description="🔄 Перезапуск бота")
-        ]
-        await self.bot.set_my_commands(commands)
+        await self.bot.set_my_commands(BOT_COMMANDS)
+    
+    def _cached_text(self, key: str, ttl: float, build, version=None) -> str:
+        """
+        Текст экрана из кэша, если он свежее ttl и version не сменилась, иначе build()
+        
+        Секундная устаревшая цифра в UI допустима — серия нажатий считается один раз.
+        """
+        now = time.monotonic()
+        cached = self._text_cache.get(key)
+        if cached and now - cached[0] < ttl and cached[1] == version:
+            return cached[2]
+        
+        text = build()
+        self._text_cache[key] = (now, version, text)
+        return text
     
     def _get_status_text(self) -> str:
+        """Текст статуса (кэш STATUS_CACHE_TTL, сброс на новом цикле / запуске / остановке монитора)"""
+        return self._cached_text(
+            'status',
+            self.STATUS_CACHE_TTL,
+            self._build_status_text,
+            version=(self.monitor.running, self.monitor.check_count)
+        )
+    
+    def _invalidate_status(self):
+        """Сбросить кэш статуса (после смены настроек / запуска / остановки)"""
+        self._text_cache.pop('status', None)
+    
+    def _build_status_text(self) -> str:
         """Текст статуса с режимами модулей"""
         
         running = self.monitor.running
-        status = "🟢 *БОТ РАБОТАЕТ*" if running else "🔴 *БОТ ОСТАНОВЛЕН*"
-        
+        snap = self.trade_manager.snapshot()
         balance = self.monitor.current_balance
-        trade_size = balance * self.monitor.balance_percent_per_trade
-        percent = int(self.monitor.balance_percent_per_trade * 100)
-        active = len(self.trade_manager.get_active_trades())
-        max_trades = self.monitor.max_open_trades
-        
-        stats = self.trade_manager.get_statistics()
-        today_pnl = stats.get('today_pnl', 0)
-        total_pnl = stats.get('total_pnl', 0)
-        win_rate = stats.get('win_rate', 0)
-        
-        ai = "✅" if self.monitor.ai_enabled else "❌"
-        api_status = "✅ Подключён" if getattr(self.monitor, 'has_api_keys', False) else "❌ Нет"
-        
-        # Подсчёт режимов модулей
         module_settings = getattr(self.monitor, 'module_settings', {})
-        signal_count = sum(1 for m in module_settings.values() if m.get('enabled') and m.get('mode') == 'signal')
-        auto_count = sum(1 for m in module_settings.values() if m.get('enabled') and m.get('mode') == 'auto')
-        
-        # Формируем строку модулей
-        modules_text = ""
-        module_icons = {
-            'director': '🎩',
-            'grid': '📊',
-            'funding': '💰',
-            'arbitrage': '🔄',
-            'listing': '🆕',
-            'worker': '👷'
-        }
         
-        for name, config in module_settings.items():
-            if config.get('enabled'):
-                icon = module_icons.get(name, '📦')
-                mode = "🤖" if config.get('mode') == 'auto' else "📢"
-                modules_text += f"{icon}{mode} "
+        # Строка модулей: иконка + режим (🤖 авто / 📢 сигналы)
+        modules = " ".join(
+            f"{MODULE_ICONS.get(name, '📦')}{'🤖' if config.get('mode') == 'auto' else '📢'}"
+            for name, config in module_settings.items()
+            if config.get('enabled')
+        )
         
-        text = f"""
-{status}
-
-🧠 AI: {ai}  •  🔐 API: {api_status}
-
-💰 *Баланс:* ${balance:,.2f}
-💵 *Сделка:* ${trade_size:,.2f} ({percent}%)
-📊 *Позиции:* {active}/{max_trades}
-
-📈 *Сегодня:* ${today_pnl:+,.2f}
-💎 *Всего:* ${total_pnl:+,.2f}
-🎯 *Win Rate:* {win_rate:.1f}%
-
-*Модули:* {modules_text.strip()}
-
-🚀 CryptoDen — управление ботом
-"""
-        return text.strip()
+        return STATUS_TEMPLATE.format_map({
+            'status': "🟢 *БОТ РАБОТАЕТ*" if running else "🔴 *БОТ ОСТАНОВЛЕН*",
+            'ai': "✅" if self.monitor.ai_enabled else "❌",
+            'api_status': "✅ Подключён" if getattr(self.monitor, 'has_api_keys', False) else "❌ Нет",
+            'balance': balance,
+            'trade_size': balance * self.monitor.balance_percent_per_trade,
+            'percent': int(self.monitor.balance_percent_per_trade * 100),
+            'active': snap.count,
+            'max_trades': self.monitor.max_open_trades,
+            'today_pnl': snap.stats.get('today_pnl', 0),
+            'total_pnl': snap.stats.get('total_pnl', 0),
+            'win_rate': snap.stats.get('win_rate', 0),
+            'modules': modules,
+        })
     
     def _apply_settings(self, settings_data: dict):
         """Применить настройки из WebApp включая режимы модулей"""
         if not settings_data:
             return
         
+        self._invalidate_status()
+        
         # Базовые настройки
         self.monitor.ai_enabled = settings_data.get('ai_enabled', True)
         self.monitor.balance_percent_per_trade = settings_data.get('risk_percent', 15) / 100
@@ -193,6 +671,43 @@ class TelegramBot:
         logger.info(f"📱 Settings applied: {len(self.monitor.symbols)} coins, API: {self.monitor.has_api_keys}")
         logger.info(f"📱 Module modes: {self.monitor.module_settings}")
     
+    def _load_saved_settings(self) -> dict:
+        """Последние настройки WebApp — после рестарта не нужно настраивать заново"""
+        try:
+            with open(SETTINGS_FILE, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Settings load error: {e}")
+            return {}
+    
+    def _session_stop_text(self) -> str:
+        """Итоги сессии для сообщения об остановке (собирать ДО monitor.stop())"""
+        from app.modules.grid_bot import grid_bot
+        from app.modules.listing_hunter import listing_hunter
+        
+        snap = self.trade_manager.snapshot()
+        stats = snap.stats
+        
+        # Получаем включённые модули
+        enabled_modules = [
+            name for name, cfg in self.monitor.module_settings.items() 
+            if cfg.get('enabled')
+        ]
+        
+        return smart_notifications.format_session_stop_message(
+            cycles=self.monitor.check_count,
+            active_trades=snap.count,
+            max_trades=self.monitor.max_open_trades,
+            total_trades=stats.get('total_trades', 0),
+            win_rate=stats.get('win_rate', 0),
+            total_pnl=stats.get('total_pnl', 0),
+            grid_cycles=grid_bot.stats.get('total_trades', 0),
+            listings_found=listing_hunter.stats.get('listings_detected', 0),
+            modules_enabled=enabled_modules
+        )
+    
     def _register_handlers(self):
         """Регистрация обработчиков"""
         
@@ -201,42 +716,27 @@ class TelegramBot:
         @self.dp.message(Command("start"))
         async def cmd_start(message: types.Message):
             """Главное меню v3.0"""
-            if not self._is_admin(message.from_user.id):
-                await message.answer("⛔ Доступ запрещён")
-                return
-            
-            await self._set_commands()
-            
-            text = """
-🦊 *CryptoDen v3.0*
-
-Добро пожаловать в умного крипто-бота!
-
-🧠 *Adaptive Brain* — анализирует рынок
-⚡ *Momentum* — ловит резкие движения
-🆕 *Listing Hunter* — новые монеты
-
-Используй кнопки ниже 👇
-"""
             await message.answer(
-                text.strip(),
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=get_main_keyboard()
+                WELCOME_TEXT,
+                parse_mode=ParseMode.HTML,
+                reply_markup=self._kb_main
             )
         
         @self.dp.message(Command("restart"))
         async def cmd_restart(message: types.Message):
             """Перезапуск бота v3.0"""
-            if not self._is_admin(message.from_user.id):
-                await message.answer("⛔ Нет доступа")
-                return
-            
             await message.answer("🔄 *Перезапускаю бота...*", parse_mode=ParseMode.MARKDOWN)
             
             try:
                 await self.monitor.stop()
                 await asyncio.sleep(2)
                 asyncio.create_task(self.monitor.start())
+                
+                # Подтверждаем, когда монитор действительно поднялся
+                try:
+                    await asyncio.wait_for(self.monitor.started_event.wait(), timeout=self.START_WAIT_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
                 await message.answer("✅ *Бот перезапущен!*", parse_mode=ParseMode.MARKDOWN)
             except Exception as e:
                 logger.error(f"Restart error: {e}")
@@ -244,55 +744,15 @@ class TelegramBot:
         
         @self.dp.message(Command("help"))
         async def cmd_help(message: types.Message):
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            text = """
-❓ *Помощь CryptoDen Bot*
-
-*🚀 CryptoDen* — открывает настройки:
-• Запустить / Остановить бота
-• API ключи Bybit
-• Выбор монет
-• Настройки рисков
-• AI параметры
-• Режимы модулей (Signal/Auto)
-
-*Кнопки навигации:*
-📊 Статус — текущее состояние бота
-🐋 Рынок — Fear & Greed, Funding, OI
-📰 Новости — рыночный контекст
-👤 Кабинет — статистика и P&L
-
-*Команды модулей:*
-/grid — 📊 Grid Bot статус
-/funding — 💰 Funding Scalper
-/arb — 🔄 Arbitrage Scanner
-/listing — 🆕 Listing Hunter
-/listing\\_mode — сменить режим (signal/auto)
-
-*AI команды:*
-/ai — 🧠 Статус AI системы
-/director — 🎩 Решения Директора
-/director\\_trades — сделки Директора
-/whale — 🐋 Детальный анализ китов
-/market — 📊 Полная картина рынка
-
-*Сервис:*
-/debug — 🔍 Диагностика
-"""
-            await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+            await message.answer(HELP_TEXT, parse_mode=ParseMode.HTML)
         
         # === WEBAPP DATA ===
         
         @self.dp.message(F.web_app_data)
         async def handle_webapp_data(message: types.Message):
             """Получение команд из WebApp"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
-                data = json.loads(message.web_app_data.data)
+                data = orjson.loads(message.web_app_data.data)
                 action = data.get('action')
                 
                 if action == 'start_bot':
@@ -302,463 +762,162 @@ class TelegramBot:
                     await message.answer("🚀 *Запускаю бота...*", parse_mode=ParseMode.MARKDOWN)
                     asyncio.create_task(self.monitor.start())
                     
-                    await asyncio.sleep(2)
+                    # Ждём готовности монитора вместо фиксированной паузы
+                    try:
+                        await asyncio.wait_for(self.monitor.started_event.wait(), timeout=self.START_WAIT_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._invalidate_status()
                     text = self._get_status_text()
-                    await message.answer(text, parse_mode=ParseMode.MARKDOWN)
-                
-                elif action == 'stop_bot':
-                    # Собираем статистику ПЕРЕД остановкой
-                    from app.modules.grid_bot import grid_bot
-                    from app.modules.listing_hunter import listing_hunter
-                    
-                    stats = self.trade_manager.get_statistics()
-                    
-                    # Получаем включённые модули
-                    enabled_modules = [
-                        name for name, cfg in self.monitor.module_settings.items() 
-                        if cfg.get('enabled')
-                    ]
-                    
-                    # Форматируем красивое сообщение
-                    text = smart_notifications.format_session_stop_message(
-                        cycles=self.monitor.check_count,
-                        active_trades=len(self.trade_manager.get_active_trades()),
-                        max_trades=self.monitor.max_open_trades,
-                        total_trades=stats.get('total_trades', 0),
-                        win_rate=stats.get('win_rate', 0),
-                        total_pnl=stats.get('total_pnl', 0),
-                        grid_cycles=grid_bot.stats.get('total_trades', 0),
-                        listings_found=listing_hunter.stats.get('listings_detected', 0),
-                        modules_enabled=enabled_modules
-                    )
-                    
-                    # Останавливаем
-                    await smart_notifications.stop()
-                    await self.monitor.stop()
-                    
-                    await message.answer(text, parse_mode=ParseMode.MARKDOWN)
-                
-                elif action == 'update_settings':
-                    settings_data = data.get('settings', {})
-                    self._apply_settings(settings_data)
-                    await message.answer("✅ *Настройки сохранены*", parse_mode=ParseMode.MARKDOWN)
-                    
-            except Exception as e:
-                logger.error(f"WebApp data error: {e}")
-        
-        # === REPLY KEYBOARD HANDLERS ===
-        
-        @self.dp.message(F.text == "📊 Статус")
-        async def btn_status(message: types.Message):
-            if not self._is_admin(message.from_user.id):
-                return
-            text = self._get_status_text()
-            await message.answer(text, parse_mode=ParseMode.MARKDOWN)
-        
-        @self.dp.message(F.text == "🐋 Рынок")
-        async def btn_market(message: types.Message):
-            """Обзор рынка"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            loading = await message.answer("🐋 *Загружаю данные...*", parse_mode=ParseMode.MARKDOWN)
-            
-            try:
-                from app.ai.whale_ai import whale_ai
-                
-                if whale_ai.last_metrics:
-                    m = whale_ai.last_metrics
-                    
-                    # Fear & Greed
-                    if m.fear_greed_index < 25:
-                        fg_emoji = "😱"
-                        fg_text = "Экстремальный страх"
-                    elif m.fear_greed_index < 45:
-                        fg_emoji = "😨"
-                        fg_text = "Страх"
-                    elif m.fear_greed_index < 55:
-                        fg_emoji = "😐"
-                        fg_text = "Нейтрально"
-                    elif m.fear_greed_index < 75:
-                        fg_emoji = "😊"
-                        fg_text = "Жадность"
-                    else:
-                        fg_emoji = "🤑"
-                        fg_text = "Экстремальная жадность"
-                    
-                    # Funding
-                    if m.funding_rate > 0.05:
-                        fund_emoji = "🔴"
-                        fund_text = "Много лонгов"
-                    elif m.funding_rate < -0.05:
-                        fund_emoji = "🟢"
-                        fund_text = "Много шортов"
-                    else:
-                        fund_emoji = "⚪"
-                        fund_text = "Нейтрально"
-                    
-                    text = f"""
-🐋 *РЫНОК СЕЙЧАС*
-
-{fg_emoji} *Fear & Greed:* {m.fear_greed_index} — {fg_text}
-
-📊 *Long/Short:* {m.long_ratio:.0f}% / {m.short_ratio:.0f}%
-
-{fund_emoji} *Funding:* {m.funding_rate:+.4f}%
-_{fund_text}_
-
-📈 *OI изменение:*
-• 1h: {m.oi_change_1h:+.1f}%
-• 24h: {m.oi_change_24h:+.1f}%
-
-🔥 *Ликвидации (24h):*
-• Long: ${m.liq_long/1e6:.1f}M
-• Short: ${m.liq_short/1e6:.1f}M
-
-💡 *Вывод:* {'Рынок перегрет, осторожно с лонгами' if m.fear_greed_index > 70 else 'Страх на рынке, хорошо для покупок' if m.fear_greed_index < 30 else 'Нейтральная ситуация'}
-"""
-                else:
-                    text = "🐋 *Данные загружаются...*\n\nПопробуйте через минуту"
-                
-                await loading.edit_text(text.strip(), parse_mode=ParseMode.MARKDOWN)
-                
-            except Exception as e:
-                await loading.edit_text(f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
-        
-        @self.dp.message(F.text == "📰 Новости")
-        async def btn_news(message: types.Message):
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            # Загружаем новости ВСЕГДА, даже если бот остановлен
-            loading_msg = await message.answer("📰 *Загружаю новости...*", parse_mode=ParseMode.MARKDOWN)
-            
-            try:
-                # Получаем свежие новости
-                from app.intelligence.news_parser import news_parser
-                news_data = await news_parser.get_market_context()
-                
-                news = news_data.get('news', [])
-                market_mode = news_data.get('market_mode', 'NORMAL')
-                
-                if not news:
-                    await loading_msg.edit_text(
-                        "📰 *Новости*\n\n_Нет актуальных новостей_",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-                    return
-                
-                # Режим рынка
-                mode_info = {
-                    'NORMAL': ('🟢', 'Нормальный', 'Можно торговать'),
-                    'NEWS_ALERT': ('🟡', 'Осторожность', 'Важные новости'),
-                    'WAIT_EVENT': ('🔴', 'Ожидание', 'Важное событие скоро')
-                }
-                mode_emoji, mode_name, mode_desc = mode_info.get(market_mode, ('⚪', 'Неизвестно', ''))
-                
-                text = f"""📰 *Новости крипторынка*
-
-{mode_emoji} *Режим: {mode_name}*
-_{mode_desc}_
-
-"""
-                
-                # Словарь переводов
-                translations = {
-                    'fed': '🏦 ФРС', 'rate': 'ставка', 'rates': 'ставки',
-                    'fomc': 'заседание ФРС', 'powell': 'Пауэлл', 'inflation': 'инфляция',
-                    'sec': '⚖️ SEC', 'etf': 'ETF', 'approve': 'одобрение',
-                    'reject': 'отклонение', 'delay': 'отсрочка', 'regulation': 'регулирование',
-                    'bitcoin': '₿ BTC', 'btc': '₿ BTC', 'halving': 'халвинг',
-                    'whale': '🐋 кит', 'whales': '🐋 киты',
-                    'ethereum': 'Ξ ETH', 'eth': 'Ξ ETH',
-                    'rally': '📈 рост', 'crash': '📉 обвал', 'pump': '🚀 рост',
-                    'dump': '💥 падение', 'bullish': '🐂 бычий', 'bearish': '🐻 медвежий',
-                    'all-time high': '🏆 ATH', 'ath': '🏆 ATH',
-                    'blackrock': '🏢 BlackRock', 'grayscale': '🏢 Grayscale',
-                    'binance': 'Binance', 'coinbase': 'Coinbase',
-                    'hack': '🔓 взлом', 'exploit': '🔓 эксплойт',
-                    'lawsuit': '⚖️ иск', 'ban': '🚫 запрет',
-                    'trump': '🇺🇸 Трамп', 'china': '🇨🇳 Китай',
-                }
-                
-                def get_hint(title: str) -> str:
-                    hints = []
-                    title_lower = title.lower()
-                    for eng, rus in translations.items():
-                        if eng in title_lower and rus not in hints:
-                            hints.append(rus)
-                    return ' • '.join(hints[:3]) if hints else None
-                
-                def get_impact_emoji(sentiment: float, importance: str) -> str:
-                    if importance == 'HIGH':
-                        return '🔴' if sentiment < 0 else '🟢' if sentiment > 0 else '🟡'
-                    elif importance == 'MEDIUM':
-                        return '🟠' if sentiment < 0 else '🟢' if sentiment > 0 else '⚪'
-                    return '⚪'
-                
-                def get_impact_text(sentiment: float) -> str:
-                    if sentiment > 0.3:
-                        return '💹 Позитивно'
-                    elif sentiment < -0.3:
-                        return '📉 Негативно'
-                    return '➖ Нейтрально'
-                
-                # Новости
-                for n in news[:6]:
-                    title = n.get('title', '')
-                    sentiment = n.get('sentiment', 0)
-                    importance = n.get('importance', 'LOW')
-                    
-                    impact_emoji = get_impact_emoji(sentiment, importance)
-                    hint = get_hint(title)
-                    impact = get_impact_text(sentiment)
-                    
-                    if len(title) > 55:
-                        title = title[:52] + '...'
-                    
-                    text += f"\n{impact_emoji} *{title}*\n"
-                    if hint:
-                        text += f"   📝 _{hint}_\n"
-                    text += f"   {impact}\n"
-                
-                # События
-                events = news_data.get('calendar', [])
-                if events:
-                    text += "\n📅 *События:*\n"
-                    for e in events[:3]:
-                        event_name = e.get('event', '')
-                        text += f"⏰ {event_name}\n"
-                
-                from datetime import datetime
-                text += f"\n_Обновлено: {datetime.now().strftime('%H:%M')}_"
-                
-                await loading_msg.edit_text(text.strip(), parse_mode=ParseMode.MARKDOWN)
-                
-            except Exception as e:
-                logger.error(f"News error: {e}")
-                await loading_msg.edit_text(
-                    f"📰 *Ошибка загрузки*\n\n_{str(e)[:80]}_",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-        
-        @self.dp.message(F.text == "👤 Кабинет")
-        async def btn_cabinet(message: types.Message):
-            """Личный кабинет — статистика"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            stats = self.trade_manager.get_statistics()
-            
-            # Расчёт win rate
-            total = stats.get('total_trades', 0)
-            wins = stats.get('winning_trades', 0)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            # P&L
-            total_pnl = stats.get('total_pnl', 0)
-            today_pnl = stats.get('today_pnl', 0)
-            
-            pnl_emoji = "📈" if total_pnl >= 0 else "📉"
-            today_emoji = "🟢" if today_pnl >= 0 else "🔴"
-            
-            text = f"""
-👤 *КАБИНЕТ*
-
-💎 *Подписка:* Premium
-📅 *Активна до:* ∞
-
-━━━━━━━━━━━━━━━
-
-💰 *Баланс:* ${self.monitor.current_balance:,.2f}
-
-{pnl_emoji} *Общий P&L:* ${total_pnl:+,.2f}
-{today_emoji} *Сегодня:* ${today_pnl:+,.2f}
-
-📊 *Статистика:*
-• Всего сделок: {total}
-• Выигрышных: {wins}
-• Win Rate: {win_rate:.1f}%
-
-📈 *Лучшая сделка:* ${stats.get('best_trade', 0):+.2f}
-📉 *Худшая сделка:* ${stats.get('worst_trade', 0):+.2f}
-
-━━━━━━━━━━━━━━━
-
-🤖 *Бот:* {'🟢 Работает' if self.monitor.running else '🔴 Остановлен'}
-🧠 *AI:* {'✅ Включён' if self.monitor.ai_enabled else '❌ Выключен'}
-📝 *Режим:* {'Paper' if self.monitor.paper_trading else '💰 LIVE'}
-"""
-            
-            await message.answer(text.strip(), parse_mode=ParseMode.MARKDOWN)
-        
-        @self.dp.message(F.text == "❓ Помощь")
-        async def btn_help(message: types.Message):
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            text = """
-❓ *ПОМОЩЬ — CryptoDen v3.0*
-
-━━━━━━━━━━━━━━━━━━
-
-📱 *КНОПКИ:*
-
-🦊 *CryptoDen* — панель управления
-• Включить/выключить бота
-• Настроить модули
-• API ключи и риски
-
-📊 *Статистика* — результаты торговли
-• Win Rate по дням/неделям
-• P&L по источникам сигналов
-• История сделок
-
-🐋 *Рынок* — whale метрики
-• Fear & Greed Index
-• Long/Short Ratio
-• Funding Rate
-
-📰 *Новости* — крипто новости
-• Sentiment анализ
-• Важные события
-
-🔍 *Анализ* — анализ монеты
-• Выбери монету
-• Получи рекомендацию AI
-
-━━━━━━━━━━━━━━━━━━
-
-⚙️ *КОМАНДЫ:*
-/start — главное меню
-/restart — перезапуск бота
-
-━━━━━━━━━━━━━━━━━━
-
-🧠 *МОДУЛИ:*
-• Brain — умный анализ рынка
-• Momentum — резкие движения
-• Listing — новые монеты
-"""
-            await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+                    await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+                
+                elif action == 'stop_bot':
+                    # Собираем статистику ПЕРЕД остановкой
+                    text = self._session_stop_text()
+                    
+                    # Останавливаем
+                    await smart_notifications.stop()
+                    await self.monitor.stop()
+                    self._invalidate_status()
+                    
+                    await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+                
+                elif action == 'update_settings':
+                    settings_data = data.get('settings', {})
+                    self._apply_settings(settings_data)
+                    await message.answer("✅ *Настройки сохранены*", parse_mode=ParseMode.MARKDOWN)
+                    
+            except Exception as e:
+                logger.error(f"WebApp data error: {e}")
+        
+        # === REPLY KEYBOARD ===
+        
+        self._btn_routes = {
+            "📊 Статус": self._btn_status,
+            "🐋 Рынок": self._btn_market,
+            "📰 Новости": self._btn_news,
+            "👤 Кабинет": self._btn_cabinet,
+            "❓ Помощь": self._btn_help,
+        }
+        
+        # Одна загрузка на кнопку: повторные нажатия во время загрузки игнорируются
+        self._btn_locks = {text: asyncio.Lock() for text in self._btn_routes}
+        
+        @self.dp.message(F.text.in_(self._btn_routes))
+        async def reply_keyboard(message: types.Message):
+            """Кнопки Reply Keyboard — поиск обработчика по словарю"""
+            lock = self._btn_locks[message.text]
+            if lock.locked():
+                logger.debug("Button {} already in progress", message.text)
+                return
+            
+            async with lock:
+                await self._btn_routes[message.text](message)
         
         @self.dp.message(Command("debug"))
         async def cmd_debug(message: types.Message):
             """Диагностика бота"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             loading = await message.answer("🔍 *Диагностика...*", parse_mode=ParseMode.MARKDOWN)
             
-            text = "🔍 *ДИАГНОСТИКА*\n\n"
+            parts = ["🔍 *ДИАГНОСТИКА*\n\n"]
             
             # 1. Монитор
-            text += "*1. Монитор:*\n"
+            parts.append("*1. Монитор:*\n")
             if self.monitor:
-                text += f"• Running: {'✅' if self.monitor.running else '❌'}\n"
-                text += f"• Symbols: {len(self.monitor.symbols)}\n"
-                text += f"• AI: {'✅' if self.monitor.ai_enabled else '❌'}\n"
-                text += f"• Paper: {'✅' if self.monitor.paper_trading else '❌ LIVE'}\n"
-                text += f"• Balance: ${self.monitor.current_balance:,.2f}\n"
-                text += f"• Cycles: {self.monitor.check_count}\n\n"
+                parts.append(f"• Running: {'✅' if self.monitor.running else '❌'}\n")
+                parts.append(f"• Symbols: {len(self.monitor.symbols)}\n")
+                parts.append(f"• AI: {'✅' if self.monitor.ai_enabled else '❌'}\n")
+                parts.append(f"• Paper: {'✅' if self.monitor.paper_trading else '❌ LIVE'}\n")
+                parts.append(f"• Balance: ${self.monitor.current_balance:,.2f}\n")
+                parts.append(f"• Cycles: {self.monitor.check_count}\n\n")
             else:
-                text += "• ❌ Не инициализирован\n\n"
+                parts.append("• ❌ Не инициализирован\n\n")
             
-            # 2. Bybit
-            text += "*2. Bybit API:*\n"
-            try:
-                from app.trading.bybit.client import BybitClient
-                async with BybitClient(testnet=False) as client:
+            # 2–6: сетевые/дисковые пробы независимы — запускаем параллельно
+            async def probe_bybit() -> str:
+                try:
+                    client = await self._get_bybit_public()
                     price = await client.get_price('BTC')
                     if price:
-                        text += f"• Статус: ✅\n"
-                        text += f"• BTC: ${price:,.2f}\n\n"
-                    else:
-                        text += "• Статус: ⚠️ Нет данных\n\n"
-            except Exception as e:
-                text += f"• Статус: ❌ {str(e)[:30]}\n\n"
+                        return f"*2. Bybit API:*\n• Статус: ✅\n• BTC: ${price:,.2f}\n\n"
+                    return "*2. Bybit API:*\n• Статус: ⚠️ Нет данных\n\n"
+                except Exception as e:
+                    return f"*2. Bybit API:*\n• Статус: ❌ {str(e)[:30]}\n\n"
             
-            # 3. Стратегии
-            text += "*3. Стратегии:*\n"
-            try:
-                from app.strategies import get_enabled_strategies, strategy_checker
-                strategies = get_enabled_strategies()
-                text += f"• Загружено: {len(strategies)}\n"
-                status = strategy_checker.get_status()
-                text += f"• Сигналов сегодня: {status.get('total_today', 0)}\n\n"
-            except Exception as e:
-                text += f"• Ошибка: {str(e)[:30]}\n\n"
+            async def probe_strategies() -> str:
+                try:
+                    strategies = get_enabled_strategies()
+                    status = strategy_checker.get_status()
+                    return (
+                        "*3. Стратегии:*\n"
+                        f"• Загружено: {len(strategies)}\n"
+                        f"• Сигналов сегодня: {status.get('total_today', 0)}\n\n"
+                    )
+                except Exception as e:
+                    return f"*3. Стратегии:*\n• Ошибка: {str(e)[:30]}\n\n"
             
-            # 4. Кэш данных
-            text += "*4. Кэш данных:*\n"
-            try:
-                from app.backtesting.data_loader import BybitDataLoader
-                loader = BybitDataLoader()
-                df = loader.load_from_cache('BTC', '5m')
-                if df is not None and len(df) > 0:
-                    text += f"• BTC: ✅ {len(df)} свечей\n"
-                    text += f"• Цена: ${df['close'].iloc[-1]:,.2f}\n\n"
-                else:
-                    text += "• ⚠️ Нет данных в кэше\n\n"
-            except Exception as e:
-                text += f"• Ошибка: {str(e)[:30]}\n\n"
+            async def probe_candles() -> str:
+                # 4. Кэш данных (те же свечи нужны и индикаторам)
+                out = ["*4. Кэш данных:*\n"]
+                df = None
+                try:
+                    df = await asyncio.to_thread(BybitDataLoader().load_from_cache, 'BTC', '5m')
+                    if df is not None and len(df) > 0:
+                        out.append(f"• BTC: ✅ {len(df)} свечей\n")
+                        out.append(f"• Цена: ${df['close'].iloc[-1]:,.2f}\n\n")
+                    else:
+                        out.append("• ⚠️ Нет данных в кэше\n\n")
+                except Exception as e:
+                    out.append(f"• Ошибка: {str(e)[:30]}\n\n")
+                
+                # 5. Индикаторы BTC
+                out.append("*5. Индикаторы BTC:*\n")
+                try:
+                    if df is not None and len(df) >= 50:
+                        df = df.tail(100).copy()
+                        ind = TechnicalIndicators()
+                        rsi = ind.rsi(df['close'], 14)
+                        ema21 = ind.ema(df['close'], 21)
+                        price = df['close'].iloc[-1]
+                        
+                        out.append(f"• RSI(14): {rsi:.1f}\n")
+                        out.append(f"• EMA(21): ${ema21:,.0f}\n")
+                        
+                        # Анализ
+                        rsi_ok = '✅' if rsi < 30 else '❌'
+                        ema_ok = '✅' if price > ema21 else '❌'
+                        out.append(f"• RSI<30: {rsi_ok}\n")
+                        out.append(f"• Price>EMA: {ema_ok}\n\n")
+                    else:
+                        out.append("• ⚠️ Нет данных\n\n")
+                except Exception as e:
+                    out.append(f"• Ошибка: {str(e)[:30]}\n\n")
+                return "".join(out)
             
-            # 5. Индикаторы BTC
-            text += "*5. Индикаторы BTC:*\n"
-            try:
-                from app.strategies.indicators import TechnicalIndicators
-                from app.backtesting.data_loader import BybitDataLoader
-                loader = BybitDataLoader()
-                df = loader.load_from_cache('BTC', '5m')
-                if df is not None and len(df) >= 50:
-                    df = df.tail(100).copy()
-                    ind = TechnicalIndicators()
-                    rsi = ind.rsi(df['close'], 14)
-                    ema21 = ind.ema(df['close'], 21)
-                    price = df['close'].iloc[-1]
-                    
-                    text += f"• RSI(14): {rsi:.1f}\n"
-                    text += f"• EMA(21): ${ema21:,.0f}\n"
-                    
-                    # Анализ
-                    rsi_ok = '✅' if rsi < 30 else '❌'
-                    ema_ok = '✅' if price > ema21 else '❌'
-                    text += f"• RSI<30: {rsi_ok}\n"
-                    text += f"• Price>EMA: {ema_ok}\n\n"
-                else:
-                    text += "• ⚠️ Нет данных\n\n"
-            except Exception as e:
-                text += f"• Ошибка: {str(e)[:30]}\n\n"
+            async def probe_news() -> str:
+                try:
+                    context = await self._get_market_context()
+                    news_count = len(context.get('news', []))
+                    mode = context.get('market_mode', 'UNKNOWN')
+                    return f"*6. Новости:*\n• Режим: {mode}\n• Новостей: {news_count}\n\n"
+                except Exception as e:
+                    return f"*6. Новости:*\n• Ошибка: {str(e)[:30]}\n\n"
             
-            # 6. Новости
-            text += "*6. Новости:*\n"
-            try:
-                from app.intelligence.news_parser import news_parser
-                context = await news_parser.get_market_context()
-                news_count = len(context.get('news', []))
-                mode = context.get('market_mode', 'UNKNOWN')
-                text += f"• Режим: {mode}\n"
-                text += f"• Новостей: {news_count}\n\n"
-            except Exception as e:
-                text += f"• Ошибка: {str(e)[:30]}\n\n"
+            parts.extend(await asyncio.gather(
+                probe_bybit(), probe_strategies(), probe_candles(), probe_news()
+            ))
             
             # Вывод
-            text += "\n💡 _Если RSI > 30 — сигналов не будет_\n"
-            text += "_Это нормально! Бот ждёт подходящий момент._"
+            parts.append(DEBUG_FOOTER)
             
-            await loading.edit_text(text, parse_mode=ParseMode.MARKDOWN)
+            await self._edit(loading, "".join(parts), parse_mode=ParseMode.MARKDOWN)
         
         @self.dp.message(Command("whale"))
         async def cmd_whale(message: types.Message):
             """🐋 Whale AI — анализ рыночных метрик"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             loading = await message.answer("🐋 *Анализирую рынок...*", parse_mode=ParseMode.MARKDOWN)
             
             try:
-                from app.ai.whale_ai import whale_ai, check_whale_activity
-                
                 # Анализируем BTC
                 alert = await check_whale_activity("BTC")
                 
@@ -772,21 +931,18 @@ _{mode_desc}_
                 
                 # Добавляем bias
                 bias = whale_ai.get_trading_bias()
-                bias_emoji = {"BULLISH": "🟢", "BEARISH": "🔴", "NEUTRAL": "⚪"}.get(bias, "⚪")
+                bias_emoji = BIAS_EMOJI.get(bias, "⚪")
                 text += f"\n\n{bias_emoji} *Bias:* {bias}"
                 
-                await loading.edit_text(text, parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, text, parse_mode=ParseMode.MARKDOWN)
                 
             except Exception as e:
                 logger.error(f"Whale AI error: {e}")
-                await loading.edit_text(f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
         
         @self.dp.message(Command("brain"))
         async def cmd_brain(message: types.Message):
             """🧠 Adaptive Brain v3.0 — статус единого AI мозга"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.brain import adaptive_brain
                 
@@ -832,14 +988,13 @@ _{mode_desc}_
         @self.dp.message(Command("stats"))
         async def cmd_stats(message: types.Message):
             """📊 Статистика торговли с Win Rate"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.core.statistics import trading_statistics
                 
-                # Получить форматированную статистику
-                stats_text = trading_statistics.format_stats_message()
+                # Получить форматированную статистику (пересчёт по всем сделкам — кэшируем)
+                stats_text = self._cached_text(
+                    'stats', self.STATS_CACHE_TTL, trading_statistics.format_stats_message
+                )
                 
                 await message.answer(stats_text, parse_mode=ParseMode.MARKDOWN)
                 
@@ -850,16 +1005,13 @@ _{mode_desc}_
         @self.dp.message(Command("analyze"))
         async def cmd_analyze(message: types.Message):
             """🧠 Adaptive Brain — анализ монеты"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
-            # Получаем символ из аргументов
-            args = message.text.split()
-            if len(args) < 2:
+            # Получаем символ из аргументов (мусор не доходит до AI и до Markdown)
+            match = ANALYZE_ARG_RE.match(message.text or "")
+            if not match:
                 await message.answer("❌ *Использование:* /analyze BTC", parse_mode=ParseMode.MARKDOWN)
                 return
             
-            symbol = args[1].upper()
+            symbol = match.group(1).upper()
             
             loading = await message.answer(f"🧠 *Анализирую {symbol}...*", parse_mode=ParseMode.MARKDOWN)
             
@@ -870,10 +1022,10 @@ _{mode_desc}_
                 decision = await adaptive_brain.analyze(symbol)
                 
                 # Форматирование результата
-                emoji = "🟢" if decision.action == TradeAction.LONG else "🔴" if decision.action == TradeAction.SHORT else "⚪"
+                emoji = DIRECTION_EMOJI.get(decision.action.value, "⚪")
                 action_text = decision.action.value
                 
-                text = f"""
+                parts = [f"""
 {emoji} *{symbol} — {action_text}*
 
 ━━━━━━━━━━━━━━━━━━
@@ -888,37 +1040,31 @@ _{mode_desc}_
 
 ━━━━━━━━━━━━━━━━━━
 
-📈 *Ключевые факторы:*
-"""
-                for factor in decision.key_factors[:5]:
-                    text += f"• {factor}\n"
+📈 *Ключевые факторы:*"""]
+                parts.extend(f"• {factor}" for factor in decision.key_factors[:5])
                 
                 if decision.restrictions:
-                    text += "\n⚠️ *Ограничения:*\n"
-                    for r in decision.restrictions[:3]:
-                        text += f"• {r}\n"
+                    parts.append("\n⚠️ *Ограничения:*")
+                    parts.extend(f"• {r}" for r in decision.restrictions[:3])
                 
-                if decision.action in [TradeAction.LONG, TradeAction.SHORT]:
-                    text += f"""
+                if decision.action in (TradeAction.LONG, TradeAction.SHORT):
+                    parts.append(f"""
 ━━━━━━━━━━━━━━━━━━
 
 📍 *Вход:* ${decision.entry_price:,.2f}
 🛑 *Стоп:* ${decision.stop_loss:,.2f}
-🎯 *Цель:* ${decision.take_profit:,.2f}
-"""
+🎯 *Цель:* ${decision.take_profit:,.2f}""")
                 
-                await loading.edit_text(text.strip(), parse_mode=ParseMode.MARKDOWN)
+                text = "\n".join(parts)
+                await self._edit(loading, text.strip(), parse_mode=ParseMode.MARKDOWN)
                 
             except Exception as e:
                 logger.error(f"Adaptive Brain analyze error: {e}")
-                await loading.edit_text(f"❌ *Ошибка анализа:* {e}", parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, f"❌ *Ошибка анализа:* {e}", parse_mode=ParseMode.MARKDOWN)
         
         @self.dp.message(Command("grid"))
         async def cmd_grid(message: types.Message):
             """📊 Grid Bot — статус сетки ордеров"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.modules.grid_bot import grid_bot
                 
@@ -932,9 +1078,6 @@ _{mode_desc}_
         @self.dp.message(Command("funding"))
         async def cmd_funding(message: types.Message):
             """💰 Funding Scalper — статус"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.modules.funding_scalper import funding_scalper
                 
@@ -951,9 +1094,6 @@ _{mode_desc}_
         @self.dp.message(Command("arb"))
         async def cmd_arbitrage(message: types.Message):
             """🔄 Arbitrage Scanner — статус"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.modules.arbitrage import arbitrage_scanner
                 
@@ -970,9 +1110,6 @@ _{mode_desc}_
         @self.dp.message(Command("listing"))
         async def cmd_listing(message: types.Message):
             """🆕 Listing Hunter — статус"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.modules.listing_hunter import listing_hunter
                 
@@ -986,9 +1123,6 @@ _{mode_desc}_
         @self.dp.message(Command("listing_mode"))
         async def cmd_listing_mode(message: types.Message):
             """🆕 Изменить режим Listing Hunter"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.modules.listing_hunter import listing_hunter
                 
@@ -1022,13 +1156,10 @@ _{mode_desc}_
         @self.dp.message(Command("momentum"))
         async def cmd_momentum(message: types.Message):
             """⚡ Momentum Detector — детектор резких движений"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.brain import momentum_detector
                 
-                text = f"""
+                parts = [f"""
 ⚡ *Momentum Detector*
 
 ━━━━━━━━━━━━━━━━━━
@@ -1047,19 +1178,20 @@ _{mode_desc}_
 ━━━━━━━━━━━━━━━━━━
 
 💾 *История цен (последние 5):*
-"""
+"""]
                 
-                for symbol, history in list(momentum_detector._price_history.items())[:5]:
-                    text += f"• {symbol}: {len(history)} точек\n"
+                for symbol, history in islice(momentum_detector._price_history.items(), 5):
+                    parts.append(f"• {symbol}: {len(history)} точек\n")
                 
                 if not momentum_detector._price_history:
-                    text += "  _Пока нет данных_\n"
+                    parts.append("  _Пока нет данных_\n")
                 
-                text += f"""
+                parts.append("""
 ━━━━━━━━━━━━━━━━━━
 
 ⚡ *v3.0 — Мгновенная реакция на рынок!*
-"""
+""")
+                text = "".join(parts)
                 
                 await message.answer(text.strip(), parse_mode=ParseMode.MARKDOWN)
                 
@@ -1070,9 +1202,6 @@ _{mode_desc}_
         @self.dp.message(Command("brain_trades"))
         async def cmd_brain_trades(message: types.Message):
             """🧠 Сделки Adaptive Brain"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.core.trade_tracker import trade_tracker
                 
@@ -1082,13 +1211,13 @@ _{mode_desc}_
                     await message.answer("📊 *Нет активных сделок от Adaptive Brain*", parse_mode=ParseMode.MARKDOWN)
                     return
                 
-                text = "🧠 *АКТИВНЫЕ СДЕЛКИ ADAPTIVE BRAIN*\n\n"
+                parts = ["🧠 *АКТИВНЫЕ СДЕЛКИ ADAPTIVE BRAIN*\n\n"]
                 
                 for trade in active:
-                    emoji = "🟢" if trade.direction == "LONG" else "🔴"
+                    emoji = DIRECTION_EMOJI.get(trade.direction, "🔴")
                     pnl_emoji = "📈" if trade.pnl_percent >= 0 else "📉"
                     
-                    text += f"""
+                    parts.append(f"""
 {emoji} *{trade.symbol} {trade.direction}*
 • Вход: ${trade.entry_price:,.2f}
 • Текущая: ${trade.current_price:,.2f}
@@ -1097,7 +1226,8 @@ _{mode_desc}_
 {pnl_emoji} P&L: {trade.pnl_percent:+.2f}% (${trade.pnl_usd:+.2f})
 • Уверенность: {trade.confidence}%
 
-"""
+""")
+                text = "".join(parts)
                 
                 await message.answer(text.strip(), parse_mode=ParseMode.MARKDOWN)
                 
@@ -1108,9 +1238,6 @@ _{mode_desc}_
         @self.dp.message(Command("tracker"))
         async def cmd_tracker(message: types.Message):
             """🎯 Trade Tracker — статистика сигнальных сделок"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.core.trade_tracker import trade_tracker
                 
@@ -1125,9 +1252,6 @@ _{mode_desc}_
         @self.dp.message(Command("session"))
         async def cmd_session(message: types.Message):
             """📊 Session Tracker — статистика сеансов"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             try:
                 from app.core.session_tracker import session_tracker
                 
@@ -1142,36 +1266,34 @@ _{mode_desc}_
         @self.dp.message(Command("market"))
         async def cmd_market(message: types.Message):
             """📊 Полная картина рынка от Adaptive Brain"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             loading = await message.answer("🧠 *Анализирую рынок...*", parse_mode=ParseMode.MARKDOWN)
             
             try:
                 from app.brain import adaptive_brain
-                from app.ai.whale_ai import whale_ai
-                import asyncio
                 
                 # Получаем метрики
                 m = whale_ai.last_metrics
                 
                 if not m:
-                    await loading.edit_text("⏳ *Данные загружаются...*\n\nПопробуйте через минуту", parse_mode=ParseMode.MARKDOWN)
+                    await self._edit(loading, "⏳ *Данные загружаются...*\n\nПопробуйте через минуту", parse_mode=ParseMode.MARKDOWN)
                     return
                 
-                # Анализируем топ-3 монеты
+                # Анализируем топ-3 монеты — параллельно, ждём самую медленную
                 top_coins = ["BTC", "ETH", "SOL"]
                 decisions = []
                 
-                for symbol in top_coins:
-                    try:
-                        decision = await adaptive_brain.analyze(symbol)
+                results = await asyncio.gather(
+                    *(adaptive_brain.analyze(symbol) for symbol in top_coins),
+                    return_exceptions=True
+                )
+                for symbol, decision in zip(top_coins, results):
+                    if isinstance(decision, Exception):
+                        logger.error(f"Market analyze error for {symbol}: {decision}")
+                    else:
                         decisions.append((symbol, decision))
-                    except Exception as e:
-                        logger.error(f"Market analyze error for {symbol}: {e}")
                 
                 # Формируем отчёт
-                text = f"""
+                parts = [f"""
 🧠 *ADAPTIVE BRAIN — РЫНОК*
 
 ━━━━━━━━━━━━━━━━━━
@@ -1191,79 +1313,80 @@ _{mode_desc}_
 ━━━━━━━━━━━━━━━━━━
 
 📊 *Анализ топ-монет:*
-
-"""
+"""]
                 
                 for symbol, decision in decisions:
-                    emoji = "🟢" if decision.action.value == "LONG" else "🔴" if decision.action.value == "SHORT" else "⚪"
-                    text += f"""
-{emoji} *{symbol}:* {decision.action.value}
+                    emoji = DIRECTION_EMOJI.get(decision.action.value, "⚪")
+                    parts.append(f"""{emoji} *{symbol}:* {decision.action.value}
 • Режим: {decision.regime.value}
 • Уверенность: {decision.confidence}%
 • {decision.reasoning[:80]}...
-
-"""
-                
-                text += f"""
-━━━━━━━━━━━━━━━━━━
-
-💡 *Рекомендация:*
-"""
+""")
                 
                 # Общая рекомендация
                 if m.fear_greed_index < 30:
-                    text += "Страх на рынке — хорошо для покупок"
+                    recommendation = "Страх на рынке — хорошо для покупок"
                 elif m.fear_greed_index > 70:
-                    text += "Жадность — осторожно с покупками"
+                    recommendation = "Жадность — осторожно с покупками"
                 else:
-                    text += "Нейтральный рынок — ждите сигналы"
+                    recommendation = "Нейтральный рынок — ждите сигналы"
+                
+                parts.append(f"""━━━━━━━━━━━━━━━━━━
+
+💡 *Рекомендация:*
+{recommendation}""")
+                text = "\n".join(parts)
                 
-                await loading.edit_text(text.strip(), parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, text.strip(), parse_mode=ParseMode.MARKDOWN)
                 
             except Exception as e:
                 logger.error(f"Market data error: {e}")
-                await loading.edit_text(f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
         
         @self.dp.message(Command("ai"))
         async def cmd_ai_status(message: types.Message):
             """🧠 Статус AI системы v3.0"""
-            if not self._is_admin(message.from_user.id):
-                return
-            
             loading = await message.answer("🔄 *Собираю данные...*", parse_mode=ParseMode.MARKDOWN)
             
             try:
-                from app.ai.whale_ai import whale_ai
                 from app.brain import adaptive_brain, momentum_detector
                 
                 # Whale AI
-                whale_text = "🐋 *Whale AI (Разведка)*\n"
-                if whale_ai.last_metrics:
-                    m = whale_ai.last_metrics
-                    whale_text += f"• Funding: {m.funding_rate:+.4f}%\n"
-                    whale_text += f"• L/S: {m.long_ratio:.0f}% / {m.short_ratio:.0f}%\n"
-                    whale_text += f"• F&G: {m.fear_greed_index}\n"
+                m = whale_ai.last_metrics
+                if m:
+                    whale_text = (
+                        "🐋 *Whale AI (Разведка)*\n"
+                        f"• Funding: {m.funding_rate:+.4f}%\n"
+                        f"• L/S: {m.long_ratio:.0f}% / {m.short_ratio:.0f}%\n"
+                        f"• F&G: {m.fear_greed_index}\n"
+                    )
                 else:
-                    whale_text += "• _Нет данных_\n"
+                    whale_text = "🐋 *Whale AI (Разведка)*\n• _Нет данных_\n"
                 
                 # Adaptive Brain
-                brain_text = "\n🧠 *Adaptive Brain (Главный мозг)*\n"
-                brain_text += f"• Модель: {adaptive_brain.model}\n"
-                brain_text += f"• Монет: {len(adaptive_brain.COINS_TOP20) + len(adaptive_brain.dynamic_coins)}\n"
-                brain_text += f"• Кэш: {len(adaptive_brain._cache)} записей\n"
-                brain_text += f"• Мин. уверенность: {adaptive_brain.MIN_CONFIDENCE}%\n"
+                brain_text = (
+                    "\n🧠 *Adaptive Brain (Главный мозг)*\n"
+                    f"• Модель: {adaptive_brain.model}\n"
+                    f"• Монет: {len(adaptive_brain.COINS_TOP20) + len(adaptive_brain.dynamic_coins)}\n"
+                    f"• Кэш: {len(adaptive_brain._cache)} записей\n"
+                    f"• Мин. уверенность: {adaptive_brain.MIN_CONFIDENCE}%\n"
+                )
                 
                 # Momentum Detector
-                momentum_text = "\n⚡ *Momentum Detector (Резкие движения)*\n"
-                momentum_text += f"• Статус: {'🟢 Активен' if momentum_detector._running else '🔴 Остановлен'}\n"
-                momentum_text += f"• Порог 1м: ±{momentum_detector.THRESHOLDS['price_change_1m']}%\n"
-                momentum_text += f"• Порог 5м: ±{momentum_detector.THRESHOLDS['price_change_5m']}%\n"
+                momentum_text = (
+                    "\n⚡ *Momentum Detector (Резкие движения)*\n"
+                    f"• Статус: {'🟢 Активен' if momentum_detector._running else '🔴 Остановлен'}\n"
+                    f"• Порог 1м: ±{momentum_detector.THRESHOLDS['price_change_1m']}%\n"
+                    f"• Порог 5м: ±{momentum_detector.THRESHOLDS['price_change_5m']}%\n"
+                )
                 
                 # Monitor
-                monitor_text = "\n📊 *Monitor (Управление)*\n"
-                monitor_text += f"• Running: {'✅' if self.monitor.running else '❌'}\n"
-                monitor_text += f"• Cycles: {self.monitor.check_count}\n"
-                monitor_text += f"• Balance: ${self.monitor.current_balance:,.2f}\n"
+                monitor_text = (
+                    "\n📊 *Monitor (Управление)*\n"
+                    f"• Running: {'✅' if self.monitor.running else '❌'}\n"
+                    f"• Cycles: {self.monitor.check_count}\n"
+                    f"• Balance: ${self.monitor.current_balance:,.2f}\n"
+                )
                 
                 text = f"""🧠 *AI SYSTEM v3.0*
 
@@ -1285,74 +1408,341 @@ _{mode_desc}_
 /brain_trades — активные сделки
 """
                 
-                await loading.edit_text(text.strip(), parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, text.strip(), parse_mode=ParseMode.MARKDOWN)
                 
             except Exception as e:
                 logger.error(f"AI status error: {e}")
-                await loading.edit_text(f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
+                await self._edit(loading, f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
+    
+    # === REPLY KEYBOARD ===
+    
+    async def _btn_status(self, message: types.Message):
+        text = self._get_status_text()
+        await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+    
+    async def _btn_market(self, message: types.Message):
+        """Обзор рынка"""
+        loading = await message.answer("🐋 *Загружаю данные...*", parse_mode=ParseMode.MARKDOWN)
+        
+        try:
+            if whale_ai.last_metrics:
+                m = whale_ai.last_metrics
+                
+                # Fear & Greed
+                if m.fear_greed_index < 25:
+                    fg_emoji = "😱"
+                    fg_text = "Экстремальный страх"
+                elif m.fear_greed_index < 45:
+                    fg_emoji = "😨"
+                    fg_text = "Страх"
+                elif m.fear_greed_index < 55:
+                    fg_emoji = "😐"
+                    fg_text = "Нейтрально"
+                elif m.fear_greed_index < 75:
+                    fg_emoji = "😊"
+                    fg_text = "Жадность"
+                else:
+                    fg_emoji = "🤑"
+                    fg_text = "Экстремальная жадность"
+                
+                # Funding
+                if m.funding_rate > 0.05:
+                    fund_emoji = "🔴"
+                    fund_text = "Много лонгов"
+                elif m.funding_rate < -0.05:
+                    fund_emoji = "🟢"
+                    fund_text = "Много шортов"
+                else:
+                    fund_emoji = "⚪"
+                    fund_text = "Нейтрально"
+                
+                text = f"""
+🐋 *РЫНОК СЕЙЧАС*
+
+{fg_emoji} *Fear & Greed:* {m.fear_greed_index} — {fg_text}
+
+📊 *Long/Short:* {m.long_ratio:.0f}% / {m.short_ratio:.0f}%
+
+{fund_emoji} *Funding:* {m.funding_rate:+.4f}%
+_{fund_text}_
+
+📈 *OI изменение:*
+• 1h: {m.oi_change_1h:+.1f}%
+• 24h: {m.oi_change_24h:+.1f}%
+
+🔥 *Ликвидации (24h):*
+• Long: ${m.liq_long/1e6:.1f}M
+• Short: ${m.liq_short/1e6:.1f}M
+
+💡 *Вывод:* {'Рынок перегрет, осторожно с лонгами' if m.fear_greed_index > 70 else 'Страх на рынке, хорошо для покупок' if m.fear_greed_index < 30 else 'Нейтральная ситуация'}
+"""
+            else:
+                text = "🐋 *Данные загружаются...*\n\nПопробуйте через минуту"
+            
+            await self._edit(loading, text.strip(), parse_mode=ParseMode.MARKDOWN)
+            
+        except Exception as e:
+            await self._edit(loading, f"❌ *Ошибка:* {e}", parse_mode=ParseMode.MARKDOWN)
+    
+    async def _btn_news(self, message: types.Message):
+        # Загружаем новости ВСЕГДА, даже если бот остановлен
+        loading_msg = await message.answer("📰 <b>Загружаю новости...</b>", parse_mode=ParseMode.HTML)
+        
+        try:
+            # Получаем свежие новости
+            news_data = await self._get_market_context()
+            
+            news = news_data.get('news', [])
+            market_mode = news_data.get('market_mode', 'NORMAL')
+            
+            if not news:
+                await self._edit(
+                    loading_msg,
+                    "📰 <b>Новости</b>\n\n<i>Нет актуальных новостей</i>",
+                    parse_mode=ParseMode.HTML
+                )
+                return
+            
+            # Заголовки и события приходят из парсера как есть — только через _h
+            parts = [NEWS_HEADERS.get(market_mode, NEWS_HEADER_UNKNOWN)]
+            
+            # Новости
+            for n in news[:6]:
+                title = n.get('title', '')
+                sentiment = n.get('sentiment', 0)
+                importance = n.get('importance', 'LOW')
+                
+                impact_emoji = _news_impact_emoji(sentiment, importance)
+                hint = _news_hint(title)
+                impact = _news_impact_text(sentiment)
+                
+                # Обрезаем до экранирования (не рвём &amp;), многоточие — один символ
+                if len(title) > NEWS_TITLE_MAX:
+                    title = title[:NEWS_TITLE_MAX - 1] + '…'
+                
+                parts.append(f"\n{impact_emoji} <b>{_h(title)}</b>\n")
+                if hint:
+                    parts.append(f"   📝 <i>{hint}</i>\n")
+                parts.append(f"   {impact}\n")
+            
+            # События
+            events = news_data.get('calendar', [])
+            if events:
+                parts.append("\n📅 <b>События:</b>\n")
+                for e in events[:3]:
+                    event_name = e.get('event', '')
+                    parts.append(f"⏰ {_h(event_name)}\n")
+            
+            parts.append(f"\n<i>Обновлено: {_clock('%H:%M')}</i>")
+            text = "".join(parts)
+            
+            await self._edit(loading_msg, text.strip(), parse_mode=ParseMode.HTML)
+            
+        except Exception as e:
+            logger.error(f"News error: {e}")
+            await self._edit(
+                loading_msg,
+                f"📰 <b>Ошибка загрузки</b>\n\n<i>{_h(str(e)[:80])}</i>",
+                parse_mode=ParseMode.HTML
+            )
+    
+    async def _btn_cabinet(self, message: types.Message):
+        """Личный кабинет — статистика"""
+        snap = self.trade_manager.snapshot()
+        stats = snap.stats
+        
+        total_pnl = stats.get('total_pnl', 0)
+        today_pnl = stats.get('today_pnl', 0)
+        
+        text = CABINET_TEMPLATE.format_map({
+            'balance': self.monitor.current_balance,
+            'pnl_emoji': "📈" if total_pnl >= 0 else "📉",
+            'total_pnl': total_pnl,
+            'today_emoji': "🟢" if today_pnl >= 0 else "🔴",
+            'today_pnl': today_pnl,
+            'total': stats.get('total_trades', 0),
+            'wins': stats.get('wins', 0),
+            'win_rate': stats.get('win_rate', 0),
+            'best': stats.get('best_trade', 0),
+            'worst': stats.get('worst_trade', 0),
+            'bot': '🟢 Работает' if self.monitor.running else '🔴 Остановлен',
+            'ai': '✅ Включён' if self.monitor.ai_enabled else '❌ Выключен',
+            'mode': 'Paper' if self.monitor.paper_trading else '💰 LIVE',
+        })
+        
+        await message.answer(text, parse_mode=ParseMode.MARKDOWN)
+    
+    async def _btn_help(self, message: types.Message):
+        await message.answer(BUTTONS_HELP_TEXT, parse_mode=ParseMode.HTML)
     
     # === УВЕДОМЛЕНИЯ ===
     
-    async def send_message(self, text: str):
+    async def send_message(self, text: str, parse_mode: str = ParseMode.MARKDOWN,
+                           dedup_key: Optional[str] = None):
+        """
+        Поставить уведомление в очередь отправки
+        
+        Внешние модули шлют Markdown; собственные уведомления бота —
+        HTML (динамические поля экранируются через _h).
+        С dedup_key повтор того же текста в течение DEDUP_TTL пропускается.
+        """
         if not self.enabled:
             return
+        
+        if dedup_key:
+            now = time.monotonic()
+            text_hash = hash(text)
+            last = self._last_sent.get(dedup_key)
+            if last and last[1] == text_hash and now - last[0] < self.DEDUP_TTL:
+                logger.debug("Duplicate notification skipped: {}", dedup_key)
+                return
+            self._last_sent[dedup_key] = (now, text_hash)
+        
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.create_task(self._sender())
+        
+        # Торговый цикл не ждёт Telegram: при переполнении теряем самое старое
+        if self._outbox.full():
+            self._outbox.get_nowait()
+            logger.warning("Telegram outbox full — dropped oldest notification")
+        self._outbox.put_nowait((text, parse_mode))
+    
+    async def _sender(self):
+        """Отправка из очереди: уведомления, пришедшие пачкой, склеиваются в одно сообщение"""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._outbox.get()]
+            
+            # Короткое окно: открытия/закрытия из одного цикла уйдут одним сообщением
+            deadline = loop.time() + self.OUTBOX_BATCH_WINDOW
+            while len(items) < self.OUTBOX_BATCH_SIZE:
+                if self._outbox.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self._outbox.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    items.append(self._outbox.get_nowait())
+            
+            for texts, parse_mode in self._coalesce(items):
+                await self._deliver(texts, parse_mode)
+                await asyncio.sleep(self.SEND_INTERVAL)
+    
+    def _coalesce(self, items: List[tuple]) -> List[tuple]:
+        """
+        Сгруппировать подряд идущие тексты одной разметки, не превышая лимит длины сообщения
+        
+        Возвращает [(тексты, parse_mode)] — группа уходит одним сообщением.
+        Точный повтор предыдущего уведомления в пачке выбрасывается.
+        """
+        groups: List[tuple] = []  # (parse_mode, [тексты])
+        length = 0
+        sep_len = len(self.MESSAGE_SEPARATOR)
+        prev = None
+        
+        for item in items:
+            if item == prev:
+                continue
+            prev = item
+            text, parse_mode = item
+            if (groups and groups[-1][0] == parse_mode
+                    and length + sep_len + len(text) <= self.MAX_MESSAGE_LENGTH):
+                groups[-1][1].append(text)
+                length += sep_len + len(text)
+            else:
+                groups.append((parse_mode, [text]))
+                length = len(text)
+        
+        return [(texts, parse_mode) for parse_mode, texts in groups]
+    
+    async def _deliver(self, texts: List[str], parse_mode: str = ParseMode.MARKDOWN):
+        """
+        Отправить группу уведомлений одним сообщением (ошибки не роняют очередь)
+        
+        Ошибка разметки в склеенной пачке — каждое уведомление уходит отдельно,
+        чтобы одно битое сообщение не лишило форматирования остальные.
+        """
+        text = self.MESSAGE_SEPARATOR.join(texts)
         try:
-            await self.bot.send_message(self.admin_id, text, parse_mode=ParseMode.MARKDOWN)
+            await self._send_to_admin(text, parse_mode)
         except Exception as e:
-            # Если ошибка Markdown — отправляем без форматирования
-            if "parse entities" in str(e).lower() or "can't parse" in str(e).lower():
+            if not _is_parse_error(e):
+                logger.error(f"Telegram error: {e}")
+            elif len(texts) > 1:
+                logger.warning(f"Batch of {len(texts)} failed to parse, sending one by one: {e}")
+                for single in texts:
+                    await self._deliver([single], parse_mode)
+                    await asyncio.sleep(self.SEND_INTERVAL)
+            else:
+                # Битая разметка — отправляем без форматирования
                 try:
-                    await self.bot.send_message(self.admin_id, text)
-                    logger.warning(f"Sent without Markdown due to: {e}")
+                    await self._send_to_admin(_plain_text(text, parse_mode), None)
+                    logger.warning(f"Sent without {parse_mode} due to: {e}")
                 except Exception as e2:
                     logger.error(f"Telegram error (retry): {e2}")
-            else:
-                logger.error(f"Telegram error: {e}")
+    
+    async def _send_to_admin(self, text: str, parse_mode: Optional[str]):
+        """sendMessage админу; при flood control ждём сколько просит Telegram и повторяем"""
+        try:
+            await self.bot.send_message(self.admin_id, text, parse_mode=parse_mode)
+        except TelegramRetryAfter as e:
+            logger.warning(f"Telegram flood control, retry in {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+            await self.bot.send_message(self.admin_id, text, parse_mode=parse_mode)
     
     async def notify_signal(self, signal):
-        emoji = "📈" if signal.direction == "LONG" else "📉"
-        text = f"""
-{emoji} *СИГНАЛ: {signal.symbol}*
-
-{signal.direction} • {signal.strategy_name}
-WR: {signal.win_rate:.1f}%
-
-Entry: ${signal.entry_price:,.4f}
-"""
-        await self.send_message(text.strip())
+        text = SIGNAL_TEMPLATE.format_map({
+            'emoji': "📈" if signal.direction == "LONG" else "📉",
+            'symbol': _h(signal.symbol),
+            'direction': signal.direction,
+            'strategy': _h(signal.strategy_name),
+            'win_rate': signal.win_rate,
+            'entry': signal.entry_price,
+        })
+        await self.send_message(text, parse_mode=ParseMode.HTML)
     
     async def notify_trade_opened(self, trade):
-        emoji = "📈" if trade.direction == "LONG" else "📉"
-        text = f"""
-✅ *ОТКРЫТА: {trade.symbol}*
-
-{emoji} {trade.direction} • ${trade.value_usdt:,.2f}
-🎯 Entry: ${trade.entry_price:,.4f}
-"""
-        await self.send_message(text.strip())
+        self._invalidate_status()  # позиции/баланс в статусе изменились
+        text = TRADE_OPENED_TEMPLATE.format_map({
+            'symbol': _h(trade.symbol),
+            'emoji': "📈" if trade.direction == "LONG" else "📉",
+            'direction': trade.direction,
+            'value': trade.value_usdt,
+            'entry': trade.entry_price,
+        })
+        await self.send_message(text, parse_mode=ParseMode.HTML)
     
     async def notify_trade_closed(self, trade):
-        emoji = "✅" if trade.unrealized_pnl >= 0 else "❌"
+        self._invalidate_status()
         reason = trade.close_reason.value if trade.close_reason else "manual"
-        text = f"""
-{emoji} *ЗАКРЫТА: {trade.symbol}*
-
-P&L: *{trade.unrealized_pnl_percent:+.2f}%* (${trade.unrealized_pnl:+.2f})
-Причина: {reason}
-"""
-        await self.send_message(text.strip())
+        text = TRADE_CLOSED_TEMPLATE.format_map({
+            'emoji': RESULT_EMOJI[trade.unrealized_pnl >= 0],
+            'symbol': _h(trade.symbol),
+            'pnl_percent': trade.unrealized_pnl_percent,
+            'pnl': trade.unrealized_pnl,
+            'reason_emoji': CLOSE_REASON_EMOJI.get(reason, "❓"),
+            'reason': _h(reason),
+        })
+        await self.send_message(text, parse_mode=ParseMode.HTML)
     
     async def notify_ai_decision(self, decision):
-        text = f"""
-🧠 *AI: {decision.action.value.upper()}*
-
-Confidence: {decision.confidence}%
-{decision.reason}
-"""
-        await self.send_message(text.strip())
+        text = AI_DECISION_TEMPLATE.format_map({
+            'action': _h(decision.action.value.upper()),
+            'confidence': decision.confidence,
+            'reason': _h(decision.reason),
+        })
+        await self.send_message(
+            text,
+            parse_mode=ParseMode.HTML,
+            dedup_key=f"ai:{getattr(decision, 'symbol', '')}"
+        )
     
     async def notify_error(self, error: str):
-        await self.send_message(f"⚠️ *Ошибка:* {error}")
+        # Монитор шлёт ошибку каждый цикл, пока она не исчезнет
+        await self.send_message(f"⚠️ <b>Ошибка:</b> {_h(error)}", parse_mode=ParseMode.HTML, dedup_key="error")
     
     async def start_polling(self):
         if not self.enabled:
@@ -1362,66 +1752,74 @@ Confidence: {decision.confidence}%
         # Настраиваем smart notifications
         smart_notifications.set_send_callback(self.send_message)
         
+        # Восстанавливаем настройки, сохранённые до рестарта
+        self._apply_settings(await asyncio.to_thread(self._load_saved_settings))
+        
         # Инициализируем файл статуса (бот остановлен)
-        update_bot_status_file(running=False)
+        await asyncio.to_thread(update_bot_status_file, running=False)
         
         # Запускаем фоновую проверку запроса запуска из WebApp
         asyncio.create_task(self._check_start_request())
         
+        # Нажатия, накопившиеся пока бот был выключен, уже неактуальны
+        await self.bot.delete_webhook(drop_pending_updates=True)
+        
         logger.info("📱 Telegram bot started")
-        await self.dp.start_polling(self.bot)
+        await self.dp.start_polling(self.bot, polling_timeout=self.POLLING_TIMEOUT)
     
     async def _check_start_request(self):
-        """Проверяет запросы на запуск/остановку из WebApp каждые 2 секунды"""
-        while True:
+        """
+        Ждёт запросы на запуск/остановку из WebApp
+        
+        С watchfiles корутина спит в inotify до изменения файла;
+        без него — опрос раз в CONTROL_POLL_INTERVAL секунд.
+        """
+        # Запрос мог появиться ещё до старта бота
+        await self._handle_control_requests()
+        
+        if awatch is not None:
             try:
-                # Проверяем запрос на ЗАПУСК
-                if os.path.exists(START_REQUESTED_FILE):
-                    with open(START_REQUESTED_FILE, 'r') as f:
-                        data = json.load(f)
-                    
-                    if data.get('requested') and not self.monitor.running:
-                        os.remove(START_REQUESTED_FILE)
-                        settings_data = data.get('settings', {})
-                        await self._apply_settings_and_start(settings_data)
-                
-                # Проверяем запрос на ОСТАНОВКУ
-                if os.path.exists(STOP_REQUESTED_FILE):
-                    os.remove(STOP_REQUESTED_FILE)
-                    
-                    if self.monitor.running:
-                        # Собираем статистику ПЕРЕД остановкой
-                        from app.modules.grid_bot import grid_bot
-                        from app.modules.listing_hunter import listing_hunter
-                        
-                        stats = self.trade_manager.get_statistics()
-                        enabled_modules = [
-                            name for name, cfg in self.monitor.module_settings.items() 
-                            if cfg.get('enabled')
-                        ]
-                        
-                        text = smart_notifications.format_session_stop_message(
-                            cycles=self.monitor.check_count,
-                            active_trades=len(self.trade_manager.get_active_trades()),
-                            max_trades=self.monitor.max_open_trades,
-                            total_trades=stats.get('total_trades', 0),
-                            win_rate=stats.get('win_rate', 0),
-                            total_pnl=stats.get('total_pnl', 0),
-                            grid_cycles=grid_bot.stats.get('total_trades', 0),
-                            listings_found=listing_hunter.stats.get('listings_detected', 0),
-                            modules_enabled=enabled_modules
-                        )
-                        
-                        await smart_notifications.stop()
-                        await self.monitor.stop()
-                        update_bot_status_file(running=False)
-                        
-                        await self.bot.send_message(self.admin_id, text, parse_mode=ParseMode.MARKDOWN)
-                        
+                os.makedirs(CONTROL_DIR, exist_ok=True)
+                async for _ in awatch(CONTROL_DIR, watch_filter=_is_control_change):
+                    await self._handle_control_requests()
             except Exception as e:
-                logger.error(f"Check request error: {e}")
+                logger.error(f"Control files watch error, fallback to polling: {e}")
+        
+        while True:
+            await asyncio.sleep(self.CONTROL_POLL_INTERVAL)
+            await self._handle_control_requests()
+    
+    async def _handle_control_requests(self):
+        """Исполнить запросы запуска/остановки, оставленные WebApp"""
+        try:
+            # Проверяем запрос на ЗАПУСК (диск — вне event loop)
+            request = await asyncio.to_thread(_read_request_file, START_REQUESTED_FILE)
+            if request:
+                data, age = request
+                
+                # Протухший запрос (например, нажали пока бот уже работал) — не исполняем
+                if age > self.CONTROL_REQUEST_TTL:
+                    await asyncio.to_thread(_discard_file, START_REQUESTED_FILE)
+                    logger.info("⌛ Stale WebApp start request dropped")
+                elif data.get('requested') and not self.monitor.running:
+                    await asyncio.to_thread(_discard_file, START_REQUESTED_FILE)
+                    settings_data = data.get('settings', {})
+                    await self._apply_settings_and_start(settings_data)
             
-            await asyncio.sleep(2)
+            # Проверяем запрос на ОСТАНОВКУ
+            if await asyncio.to_thread(_discard_file, STOP_REQUESTED_FILE):
+                if self.monitor.running:
+                    # Собираем статистику ПЕРЕД остановкой
+                    text = self._session_stop_text()
+                    
+                    await smart_notifications.stop()
+                    await self.monitor.stop()
+                    await asyncio.to_thread(update_bot_status_file, running=False)
+                    
+                    await self.bot.send_message(self.admin_id, text, parse_mode=ParseMode.MARKDOWN)
+                    
+        except Exception as e:
+            logger.error(f"Check request error: {e}")
     
     async def send_animated_startup(self, settings_data: dict):
         """
@@ -1441,36 +1839,33 @@ Confidence: {decision.confidence}%
             "⏳ *Запускаю CryptoDen...*",
             parse_mode=ParseMode.MARKDOWN
         )
-        await asyncio.sleep(0.8)
+        self._last_edit_at[msg.chat.id] = time.monotonic()
         
         # ШАГ 2
-        await msg.edit_text(
+        await self._edit_frame(
+            msg,
             "⏳ *Запускаю CryptoDen...*\n"
-            "✅ Подключение к данным",
-            parse_mode=ParseMode.MARKDOWN
+            "✅ Подключение к данным"
         )
-        await asyncio.sleep(0.8)
         
         # ШАГ 3
-        await msg.edit_text(
+        await self._edit_frame(
+            msg,
             "⏳ *Запускаю CryptoDen...*\n"
             "✅ Подключение к данным\n"
-            "✅ Загрузка индикаторов",
-            parse_mode=ParseMode.MARKDOWN
+            "✅ Загрузка индикаторов"
         )
-        await asyncio.sleep(0.8)
         
         # ШАГ 4
-        await msg.edit_text(
+        await self._edit_frame(
+            msg,
             "⏳ *Запускаю CryptoDen...*\n"
             "✅ Подключение к данным\n"
             "✅ Загрузка индикаторов\n"
-            "✅ Анализ рынка",
-            parse_mode=ParseMode.MARKDOWN
+            "✅ Анализ рынка"
         )
-        await asyncio.sleep(1)
         
-        # Получаем реальные данные
+        # Получаем реальные данные (идёт в счёт паузы перед финальным кадром)
         market = await self._get_market_data_for_startup()
         
         # Финальное сообщение
@@ -1479,7 +1874,40 @@ Confidence: {decision.confidence}%
         else:
             final_text = self._format_startup_signal(settings_data, market)
         
-        await msg.edit_text(final_text, parse_mode=ParseMode.MARKDOWN)
+        await self._edit_frame(msg, final_text, final=True)
+    
+    async def _edit(self, msg: types.Message, text: str, parse_mode: str = ParseMode.MARKDOWN):
+        """Единая точка редактирования сообщений бота (учёт времени для EDIT_INTERVAL)"""
+        await self.bot.edit_message_text(
+            text=text,
+            chat_id=msg.chat.id,
+            message_id=msg.message_id,
+            parse_mode=parse_mode
+        )
+        self._last_edit_at[msg.chat.id] = time.monotonic()
+    
+    async def _edit_frame(self, msg: types.Message, text: str, final: bool = False):
+        """
+        Кадр анимации — не чаще EDIT_INTERVAL на чат
+        
+        Промежуточный кадр при флуд-лимите пропускается (его всё равно
+        сменит следующий), финальный — дожидается retry_after.
+        """
+        chat_id = msg.chat.id
+        wait = self.EDIT_INTERVAL - (time.monotonic() - self._last_edit_at.get(chat_id, 0))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        
+        try:
+            await self._edit(msg, text, parse_mode=ParseMode.MARKDOWN)
+        except TelegramRetryAfter as e:
+            if not final:
+                logger.debug("Frame skipped (flood, retry in {}s)", e.retry_after)
+                return
+            await asyncio.sleep(e.retry_after)
+            await self._edit(msg, text, parse_mode=ParseMode.MARKDOWN)
+        finally:
+            self._last_edit_at[chat_id] = time.monotonic()
     
     async def _get_market_data_for_startup(self) -> dict:
         """Получить реальные данные рынка"""
@@ -1493,36 +1921,36 @@ Confidence: {decision.confidence}%
         }
         
         try:
+            async def fetch_price():
+                client = await self._get_bybit_public()
+                return await client.get_price("BTC")
+            
+            async def fetch_metrics():
+                return whale_ai.last_metrics or await whale_ai.get_market_metrics("BTC")
+            
+            # Цена, свечи из кэша и метрики независимы — грузим параллельно
+            price, df, metrics = await asyncio.gather(
+                fetch_price(),
+                asyncio.to_thread(BybitDataLoader().load_from_cache, "BTC", "5m"),
+                fetch_metrics(),
+                return_exceptions=True
+            )
+            
             # Цена BTC
-            from app.trading.bybit.client import BybitClient
-            async with BybitClient(testnet=False) as client:
-                price = await client.get_price("BTC")
-                if price:
-                    data["btc_price"] = price
+            if isinstance(price, Exception):
+                logger.error(f"Startup BTC price error: {price}")
+            elif price:
+                data["btc_price"] = price
             
             # RSI
-            from app.backtesting.data_loader import BybitDataLoader
-            from app.strategies.indicators import TechnicalIndicators
-            
-            loader = BybitDataLoader()
-            df = loader.load_from_cache("BTC", "5m")
-            if df is not None and len(df) >= 20:
+            if not isinstance(df, Exception) and df is not None and len(df) >= 20:
                 ind = TechnicalIndicators()
                 data["btc_rsi"] = ind.rsi(df['close'].tail(50), 14)
             
             # Fear & Greed + Funding
-            from app.ai.whale_ai import whale_ai
-            if whale_ai.last_metrics:
-                data["fear_greed"] = whale_ai.last_metrics.fear_greed_index
-                data["funding_rate"] = whale_ai.last_metrics.funding_rate
-            else:
-                try:
-                    metrics = await whale_ai.get_market_metrics("BTC")
-                    if metrics:
-                        data["fear_greed"] = metrics.fear_greed_index
-                        data["funding_rate"] = metrics.funding_rate
-                except:
-                    pass
+            if metrics and not isinstance(metrics, Exception):
+                data["fear_greed"] = metrics.fear_greed_index
+                data["funding_rate"] = metrics.funding_rate
             
             # Fear & Greed текст
             fg = data["fear_greed"]
@@ -1538,7 +1966,6 @@ Confidence: {decision.confidence}%
                 data["fear_greed_text"] = "Экстремальная жадность"
             
             # Время до Funding
-            from datetime import datetime
             now = datetime.utcnow()
             for h in [0, 8, 16]:
                 if now.hour < h:
@@ -1585,11 +2012,7 @@ Confidence: {decision.confidence}%
         
         # Модули
         modules = self.monitor.module_settings
-        module_icons = {
-            'director': '🎩', 'grid': '📊', 'funding': '💰',
-            'arbitrage': '🔄', 'listing': '🆕', 'worker': '👷'
-        }
-        active = [module_icons.get(n, '📦') for n, cfg in modules.items() if cfg.get('enabled')]
+        active = [MODULE_ICONS.get(n, '📦') for n, cfg in modules.items() if cfg.get('enabled')]
         
         # Монеты
         active_coins = self.monitor.symbols
@@ -1601,7 +2024,6 @@ Confidence: {decision.confidence}%
         btc_price = market.get("btc_price", 0)
         btc_str = f"${btc_price:,.0f}" if btc_price > 0 else "загрузка..."
         
-        from datetime import datetime
         return f"""
 🚀 *CryptoDen ЗАПУЩЕН!*
 
@@ -1629,7 +2051,7 @@ _Вы получаете рекомендации, торгуете сами_
 Анализирую рынок... Сигнал придёт 
 с объяснением и рекомендацией!
 
-⏰ {datetime.now().strftime('%H:%M:%S')}
+⏰ {_clock()}
 """.strip()
     
     def _format_startup_auto(self, settings_data: dict, market: dict) -> str:
@@ -1644,7 +2066,6 @@ _Вы получаете рекомендации, торгуете сами_
         pct = int(self.monitor.balance_percent_per_trade * 100)
         
         # Заменяем заголовок
-        from datetime import datetime
         header = f"""
 🚀 *CryptoDen ЗАПУЩЕН!*
 
@@ -1678,8 +2099,9 @@ _Бот торгует самостоятельно_
             # Запускаем монитор
             asyncio.create_task(self.monitor.start())
             
-            # Обновляем статус для WebApp
-            update_bot_status_file(
+            # Обновляем статус для WebApp (запись файла — вне event loop)
+            await asyncio.to_thread(
+                update_bot_status_file,
                 running=True,
                 balance=self.monitor.current_balance,
                 active_trades=len(self.trade_manager.get_active_trades()),
@@ -1692,6 +2114,11 @@ _Бот торгует самостоятельно_
             await self.send_message(f"❌ *Ошибка:* {e}")
     
     async def stop(self):
+        if self._sender_task:
+            self._sender_task.cancel()
+        if self._bybit_public:
+            await self._bybit_public.__aexit__(None, None, None)
+            self._bybit_public = None
         if self.bot:
             await self.bot.session.close()
 
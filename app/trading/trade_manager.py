@@ -4,6 +4,7 @@ Trade Manager — Управление сделками
 - Автоматический SL/TP
 - Trailing Stop
 """
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -172,6 +173,19 @@ class Trade:
         }
 
 
+@dataclass
+class TradeSnapshot:
+    """Срез состояния для UI — активные сделки и статистика за один проход"""
+    active: tuple
+    stats: dict
+    total_value: float
+    total_unrealized: float
+    
+    @property
+    def count(self) -> int:
+        return len(self.active)
+
+
 class TradeManager:
     """
     Менеджер сделок
@@ -182,11 +196,18 @@ class TradeManager:
     - Автоматическое закрытие по SL/TP/Trailing
     """
     
+    TRADE_HISTORY_LIMIT = 10_000
+    
     def __init__(self):
         self.active_trades: Dict[str, Trade] = {}  # trade_id -> Trade
-        self.trade_history: List[Trade] = []
+        self.trade_history: deque = deque(maxlen=self.TRADE_HISTORY_LIMIT)
         self.trade_counter: int = 0
         
+        # Итоги по закрытым сделкам — копятся при закрытии, не пересчитываются
+        self.closed_count: int = 0
+        self.wins_count: int = 0
+        self.realized_pnl: float = 0.0
+        
         # Настройки
         self.max_trades_per_symbol: int = 1
         self.max_total_trades: int = 5
@@ -282,6 +303,11 @@ class TradeManager:
         
         self.trade_history.append(trade)
         
+        self.closed_count += 1
+        self.realized_pnl += trade.unrealized_pnl
+        if trade.unrealized_pnl > 0:
+            self.wins_count += 1
+        
         emoji = "✅" if trade.unrealized_pnl >= 0 else "❌"
         logger.info(f"{emoji} Trade closed: {trade_id}")
         logger.info(f"   Reason: {reason.value}")
@@ -296,10 +322,21 @@ class TradeManager:
         """Получить активные сделки"""
         return list(self.active_trades.values())
     
+    def snapshot(self) -> TradeSnapshot:
+        """Срез для экранов бота (вместо повторных get_active_trades/get_statistics)"""
+        active = tuple(self.active_trades.values())
+        
+        return TradeSnapshot(
+            active=active,
+            stats=self.get_statistics(),
+            total_value=sum(t.value_usdt for t in active),
+            total_unrealized=sum(t.unrealized_pnl for t in active),
+        )
+    
     def get_statistics(self) -> dict:
         """Статистика торговли"""
         
-        if not self.trade_history:
+        if not self.closed_count:
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -307,15 +344,12 @@ class TradeManager:
                 'active_trades': len(self.active_trades),
             }
         
-        wins = [t for t in self.trade_history if t.unrealized_pnl > 0]
-        total_pnl = sum(t.unrealized_pnl for t in self.trade_history)
-        
         return {
-            'total_trades': len(self.trade_history),
-            'wins': len(wins),
-            'losses': len(self.trade_history) - len(wins),
-            'win_rate': len(wins) / len(self.trade_history) * 100,
-            'total_pnl': round(total_pnl, 2),
+            'total_trades': self.closed_count,
+            'wins': self.wins_count,
+            'losses': self.closed_count - self.wins_count,
+            'win_rate': self.wins_count / self.closed_count * 100,
+            'total_pnl': round(self.realized_pnl, 2),
             'active_trades': len(self.active_trades),
         }
 
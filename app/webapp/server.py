@@ -6,6 +6,7 @@ from flask_cors import CORS
 import os
 import json
 import asyncio
+import tempfile
 import threading
 
 app = Flask(__name__, 
@@ -32,6 +33,25 @@ SETTINGS_FILE = "/root/crypto-bot/data/webapp_settings.json"
 START_REQUESTED_FILE = "/root/crypto-bot/data/start_requested.json"
 
 
+def write_json_atomic(path: str, data, indent: int = 2):
+    """
+    Записать JSON атомарно: уникальный tmp рядом + os.replace
+    
+    Бот читает эти файлы параллельно — полуписаный JSON он не увидит.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            os.fchmod(f.fileno(), 0o644)
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_file, path)
+    except Exception:
+        os.unlink(tmp_file)
+        raise
+
+
 def load_settings() -> dict:
     """Загрузить настройки"""
     default = {
@@ -63,19 +83,15 @@ def load_settings() -> dict:
 
 def save_settings(settings: dict):
     """Сохранить настройки"""
-    os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+    write_json_atomic(SETTINGS_FILE, settings)
 
 
 def request_start(settings: dict):
     """Создать запрос на запуск бота"""
-    os.makedirs(os.path.dirname(START_REQUESTED_FILE), exist_ok=True)
-    with open(START_REQUESTED_FILE, 'w') as f:
-        json.dump({
-            "requested": True,
-            "settings": settings
-        }, f, indent=2)
+    write_json_atomic(START_REQUESTED_FILE, {
+        "requested": True,
+        "settings": settings
+    })
 
 
 @app.route('/')
@@ -166,9 +182,7 @@ def get_bot_status():
 def stop_bot():
     """Остановить бота"""
     STOP_REQUESTED_FILE = "/root/crypto-bot/data/stop_requested.json"
-    os.makedirs(os.path.dirname(STOP_REQUESTED_FILE), exist_ok=True)
-    with open(STOP_REQUESTED_FILE, 'w') as f:
-        json.dump({"requested": True}, f)
+    write_json_atomic(STOP_REQUESTED_FILE, {"requested": True}, indent=None)
     
     return jsonify({
         "status": "ok",
@@ -554,9 +568,7 @@ def save_news_settings():
     
     try:
         data = request.json
-        os.makedirs(os.path.dirname(settings_file), exist_ok=True)
-        with open(settings_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json_atomic(settings_file, data)
         return jsonify({"success": True})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})